@@ -0,0 +1,16 @@
+"""Sample data for the benchmarks of the budget envelope integration."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# envelope-stats.json as written by the budget-envelopes library
+FIXTURE_FILE = DATA_DIR / "envelope-stats.json"
+
+
+def load_fixture() -> list[dict]:
+    """Return the records of the sample envelope-stats.json."""
+    with FIXTURE_FILE.open(encoding="utf8") as fixture:
+        return json.load(fixture)
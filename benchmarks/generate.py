@@ -0,0 +1,121 @@
+"""Generate synthetic envelope-stats.json files.
+
+Run from the repository root, e.g.:
+
+    python -m benchmarks.generate --envelopes 150 --depth 3 --months 120 out.json
+
+Writes one record per envelope and month like the budget-envelopes library,
+including the "" envelope for the total, ":" separated sub-envelopes and a
+configurable share of missing (null or NaN) carryovers.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+
+
+def envelope_names(count: int, depth: int) -> list[str]:
+    """Return count envelope names with at most depth levels, parents first."""
+    # children per envelope so that depth levels hold at least count envelopes
+    fanout = 1
+    while sum(fanout**level for level in range(1, depth + 1)) < count:
+        fanout += 1
+
+    names: list[str] = []
+    level = [""]
+    while len(names) < count:
+        children = []
+        for parent in level:
+            for index in range(fanout):
+                name = f"Envelope{len(names) + 1}"
+                children.append(f"{parent}:{name}" if parent else name)
+                names.append(children[-1])
+                if len(names) == count:
+                    return names
+        level = children
+    return names
+
+
+def month_labels(months: int, first: str = "2014-01") -> list[str]:
+    """Return months consecutive "YYYY-MM" labels starting at first."""
+    year, month = (int(part) for part in first.split("-"))
+    start = year * 12 + month - 1
+    return [
+        f"{index // 12:04d}-{index % 12 + 1:02d}" for index in range(start, start + months)
+    ]
+
+
+def generate_records(
+    envelopes: int,
+    depth: int,
+    months: int,
+    missing_carryover: float = 0.05,
+    seed: int = 0,
+) -> list[dict]:
+    """Return the records of a synthetic states file."""
+    rng = random.Random(seed)
+    labels = month_labels(months)
+    records = []
+    for envelope in ["", *envelope_names(envelopes, depth)]:
+        budget = float(rng.randrange(10, 1000))
+        state = 0.0
+        for index, month in enumerate(labels):
+            if rng.random() < 0.1:
+                budget = float(rng.randrange(10, 1000))
+            state_month = float(round(budget - rng.uniform(0, 1.5 * budget)))
+            carryover = state + rng.uniform(-0.5, 0.5) if index else None
+            if carryover is not None and rng.random() < missing_carryover:
+                carryover = rng.choice((None, math.nan))
+            state += state_month
+            record = {
+                "envelope": envelope,
+                "month": month,
+                "budget": budget,
+                "state_month": state_month,
+                "state": state,
+                "carryover": carryover,
+            }
+            if rng.random() < 0.05:
+                record["adjustment"] = float(rng.randrange(-200, 200))
+            records.append(record)
+    return records
+
+
+def write_states_file(path: str, records: list[dict]) -> None:
+    """Write records as envelope-stats.json."""
+    with open(path, "w", encoding="utf8") as statesfile:
+        json.dump(records, statesfile, indent=4)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the generator options to an argument parser."""
+    parser.add_argument("--envelopes", type=int, default=150)
+    parser.add_argument("--depth", type=int, default=2, help="hierarchy levels")
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument(
+        "--missing-carryover",
+        type=float,
+        default=0.05,
+        help="share of null/NaN carryovers",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main() -> None:
+    """Write a synthetic states file."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("output", help="path of the envelope-stats.json to write")
+    args = parser.parse_args()
+
+    records = generate_records(
+        args.envelopes, args.depth, args.months, args.missing_carryover, args.seed
+    )
+    write_states_file(args.output, records)
+    print(f"Wrote {len(records)} records to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
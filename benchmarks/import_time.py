@@ -0,0 +1,80 @@
+"""Import time benchmark of the budget envelope integration.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python -m benchmarks.import_time
+
+Imports the integration in fresh interpreters with ``-X importtime`` and exits
+with status 1 if its own modules, not counting Home Assistant and other
+dependencies, take longer to import than the budget.
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import re
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.budgetenvelope"
+
+# milliseconds the integration's own modules may take to import, with
+# headroom over the 20-25 ms they take with Home Assistant 2025.4 on Python
+# 3.13, so that a slow run does not fail
+IMPORT_BUDGET_MS = 40.0
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+
+
+def measure() -> tuple[float, float]:
+    """Import the integration once, return its own and its total milliseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {PACKAGE}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    own = total = 0
+    for line in result.stderr.splitlines():
+        if (match := IMPORTTIME_LINE.match(line)) is None:
+            continue
+        self_us, cumulative_us, module = match.groups()
+        if module == PACKAGE:
+            total = int(cumulative_us)
+        if module == PACKAGE or module.startswith(f"{PACKAGE}."):
+            own += int(self_us)
+    return own / 1000, total / 1000
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="number of imports")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=IMPORT_BUDGET_MS,
+        help="milliseconds the own modules may take",
+    )
+    args = parser.parse_args()
+
+    # the first import also compiles the byte code, it is not counted
+    measure()
+    runs = [measure() for _ in range(args.runs)]
+    own = min(run[0] for run in runs)
+    total = min(run[1] for run in runs)
+
+    print(
+        f"{PACKAGE}: {own:.1f} ms own modules, {total:.1f} ms with dependencies"
+        f" (budget {args.budget:.1f} ms)"
+    )
+    if own > args.budget:
+        print("Import time budget exceeded", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
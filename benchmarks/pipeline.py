@@ -0,0 +1,229 @@
+"""Benchmark of the coordinator pipeline and the sensor entity setup.
+
+Run from the repository root in an environment with Home Assistant 2024.5 or
+later installed, see requirements_test.txt:
+
+    python -m benchmarks.pipeline --envelopes 150 --depth 3 --months 120
+
+Generates a states file (or uses --file), then reports latency, throughput
+and peak memory of hashing, stream parsing and processing it with the
+EnvelopeCoordinator and of building the sensor entities. Home Assistant
+itself is replaced by a minimal local stand-in, nothing is started.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import os
+from pathlib import Path
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_FILE_PATH, CONF_NAME
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from custom_components.budgetenvelope import EnvelopeCoordinator, contents_digest
+from custom_components.budgetenvelope import sensor
+from custom_components.budgetenvelope.const import DOMAIN
+from custom_components.budgetenvelope.streaming import JsonArrayReader
+
+from .generate import add_arguments, generate_records, write_states_file
+
+
+class StandInConfig:
+    """Stand-in for the Home Assistant configuration."""
+
+    def __init__(self, config_dir: str) -> None:
+        """Initialize the configuration."""
+        self.config_dir = config_dir
+
+    def path(self, *path: str) -> str:
+        """Return a path below the configuration directory."""
+        return os.path.join(self.config_dir, *path)
+
+
+class StandInRegistryItems(dict):
+    """Stand-in for the items of a registry, none of them is stale.
+
+    Mirrors the config entry indexes the registry helpers use since Home
+    Assistant 2024.5.
+    """
+
+    def get_entries_for_config_entry_id(self, config_entry_id: str) -> list:
+        """Return the entities of a config entry."""
+        return []
+
+    def get_devices_for_config_entry_id(self, config_entry_id: str) -> list:
+        """Return the devices of a config entry."""
+        return []
+
+
+class StandInEntityRegistry:
+    """Stand-in for the entity registry, the benchmark registers no entities."""
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self.entities = StandInRegistryItems()
+
+
+class StandInDeviceRegistry:
+    """Stand-in for the device registry, keeps the devices in a dict."""
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self.devices = StandInRegistryItems()
+
+    def async_get_or_create(self, *, config_entry_id: str, **device) -> dict:
+        """Add or update a device."""
+        entry = self.devices.setdefault(
+            frozenset(device["identifiers"]), {"config_entry_id": config_entry_id}
+        )
+        entry.update(device)
+        return entry
+
+
+class StandInHomeAssistant:
+    """Stand-in for HomeAssistant with what the coordinator and platform use."""
+
+    def __init__(self, config_dir: str) -> None:
+        """Initialize the stand-in."""
+        self.data: dict = {
+            dr.DATA_REGISTRY: StandInDeviceRegistry(),
+            er.DATA_REGISTRY: StandInEntityRegistry(),
+        }
+        self.config = StandInConfig(config_dir)
+
+    async def async_add_executor_job(self, target: Callable, *args):
+        """Run a job inline, the benchmark has no event loop contention."""
+        return target(*args)
+
+
+class StandInConfigEntry:
+    """Stand-in for the config entry of the integration."""
+
+    domain = DOMAIN
+    entry_id = "benchmark"
+    title = "Benchmark"
+    options: dict = {}
+
+    def __init__(self, file_path: str) -> None:
+        """Initialize the entry."""
+        self.data = {CONF_NAME: self.title, CONF_FILE_PATH: file_path}
+
+    def async_on_unload(self, func: Callable) -> None:
+        """Ignore unload callbacks, nothing is unloaded."""
+
+
+def measure(phase: Callable, runs: int) -> tuple[float, float, object]:
+    """Return the median seconds, the peak memory in MiB and a result of phase."""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = phase()
+        durations.append(time.perf_counter() - start)
+
+    # measure memory separately, tracing slows down the phase
+    tracemalloc.start()
+    phase()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(durations), peak / 2**20, result
+
+
+def run(file_path: str, runs: int, config_dir: str) -> None:
+    """Benchmark the pipeline on a states file and print the results."""
+    hass = StandInHomeAssistant(config_dir)
+    entry = StandInConfigEntry(file_path)
+    config_entries.current_entry.set(entry)
+    coordinator = EnvelopeCoordinator(hass, file_path)
+    hass.data[DOMAIN] = {entry.entry_id + "_coordinator": coordinator}
+
+    size = os.path.getsize(file_path)
+
+    def read():
+        # hashing alone, as when checking the persisted snapshot
+        contents_digest(file_path)
+
+    def parse():
+        with open(file_path, "rb") as statesfile:
+            reader = JsonArrayReader(statesfile)
+            for _ in reader:
+                pass
+        return reader.items
+
+    def process():
+        # hashing, parsing and processing interleave like in the coordinator,
+        # bypass its change detection so every run reads the file
+        coordinator.file_signature = None
+        _, reader = coordinator.read_states(file_path)
+        with reader.file:
+            return coordinator.process_states(reader)
+
+    def build_entities():
+        # every run registers the devices again
+        coordinator.devices = {}
+        entities = []
+        asyncio.run(sensor.async_setup_entry(hass, entry, entities.extend))
+        return entities
+
+    results = []
+    duration, peak, _ = measure(read, runs)
+    results.append(("read", duration, peak, f"{size / 2**20 / duration:.1f} MiB/s"))
+
+    duration, peak, records = measure(parse, runs)
+    results.append(("parse", duration, peak, f"{records / duration:,.0f} records/s"))
+
+    duration, peak, (data, _, tree, _) = measure(process, runs)
+    results.append(("process", duration, peak, f"{records / duration:,.0f} records/s"))
+
+    # the setup computes the values of the sensors from the data
+    coordinator.data = data
+    coordinator.tree = tree
+    duration, peak, entities = measure(build_entities, runs)
+    results.append(
+        ("entities", duration, peak, f"{len(entities) / duration:,.0f} entities/s")
+    )
+
+    print(
+        f"{Path(file_path).name}: {size / 2**20:.1f} MiB, {records} records,"
+        f" {len(data)} envelopes, {len(entities)} entities, median of {runs} runs"
+    )
+    print(f"{'phase':<10}{'latency':>12}{'peak memory':>14}  throughput")
+    for phase, duration, peak, throughput in results:
+        print(f"{phase:<10}{duration * 1000:>9.1f} ms{peak:>10.1f} MiB  {throughput}")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--file", help="benchmark this states file instead")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    # also the configuration directory of the stand-in
+    with tempfile.TemporaryDirectory(prefix="budgetenvelope-benchmark-") as directory:
+        if args.file:
+            run(args.file, args.runs, directory)
+            return
+
+        file_path = os.path.join(directory, "envelope-stats.json")
+        write_states_file(
+            file_path,
+            generate_records(
+                args.envelopes,
+                args.depth,
+                args.months,
+                args.missing_carryover,
+                args.seed,
+            ),
+        )
+        run(file_path, args.runs, directory)
+
+
+if __name__ == "__main__":
+    main()
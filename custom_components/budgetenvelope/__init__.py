@@ -2,36 +2,82 @@
 from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform, CONF_FILE_PATH
+from homeassistant.const import (
+    CONF_FILE_PATH,
+    CONF_SCAN_INTERVAL,
+    Platform,
+)
 from homeassistant.core import HomeAssistant, callback
 
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
+    UpdateFailed,
 )
+from homeassistant.util import dt as dt_util
 
 import logging
+from array import array
+from collections.abc import Callable, Iterable, Mapping
+import hashlib
 import json
-from datetime import timedelta
-import math
+import os
+import sys
+import time
+from types import MappingProxyType
+from typing import NamedTuple
 import async_timeout
 
 _LOGGER = logging.getLogger(__name__)
 
-from .const import DOMAIN
+from .const import (
+    CONF_CURRENCY,
+    DEFAULT_CURRENCY,
+    DOMAIN,
+    REFRESH_LATENCY_BUDGET,
+    RETRY_MAX,
+    RETRY_MID_WRITE,
+    RETRY_UNAVAILABLE,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    WATCH_SAFETY_INTERVAL,
+)
+from .derived import derive_columns, from_cents, money, to_cents
+from .envelope import EnvelopeState
+from .hierarchy import ROOT, EnvelopeTree
+from .history import HistoryStore, month_index
+from .validation import Quarantine, RecordError, validate_record
+from .streaming import CHUNK_SIZE, JsonArrayReader
+from .watcher import EnvelopeFileWatcher
+
+# Context of the entities reporting the health of the coordinator itself,
+# they are updated after every refresh.
+DIAGNOSTICS = object()
 
 # For your initial PR, limit it to 1 platform.
 PLATFORMS: list[Platform] = [Platform.SENSOR]  # PLATFORM.TEXT
 
 
-def get_object_value(value) -> str:
-    """Get value from object or enum."""
+def new_digest():
+    """Return the hash object used to detect unchanged file contents."""
+    return hashlib.blake2b(digest_size=16)
+
 
-    while hasattr(value, "value"):
-        value = value.value
+def contents_digest(file_path) -> bytes:
+    """Return the digest used to detect unchanged file contents.
 
-    return value
+    The file is hashed chunk by chunk instead of being read as a whole.
+    """
+    digest = new_digest()
+    with open(file_path, "rb") as statesfile:
+        while chunk := statesfile.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.digest()
 
 
 # async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> bool:
@@ -53,7 +99,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data[DOMAIN][entry.entry_id + "_coordinator"] = coordinator
 
-    await coordinator.async_config_entry_first_refresh()
+    # The file is read once at startup, all platforms share the data of this
+    # refresh or of the persisted snapshot and must not refresh themselves.
+    start = time.monotonic()
+    if await coordinator.async_restore_snapshot():
+        coordinator.startup_timings["restore"] = time.monotonic() - start
+        # create the entities from the persisted snapshot right away and
+        # revalidate the file in the background
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} {entry.title} revalidate"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+        coordinator.startup_timings.update(coordinator.timings)
+
+    # refresh whenever the producer rewrote the file instead of polling it,
+    # the watcher already debounces so skip the request refresh cooldown
+    watcher = EnvelopeFileWatcher(
+        hass,
+        entry.data[CONF_FILE_PATH],
+        coordinator.async_refresh,
+        safety_interval=entry.options.get(CONF_SCAN_INTERVAL, WATCH_SAFETY_INTERVAL),
+    )
+    await watcher.async_start()
+    entry.async_on_unload(watcher.async_stop)
+    entry.async_on_unload(coordinator.async_cancel_retry)
+
+    # the options select the entities, apply them with a reload
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     # my_api = hass.data[DOMAIN][entry.entry_id]
     # coordinator = EnvelopeCoordinator(hass, my_api)
@@ -62,9 +135,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     #    BudgetEnvelope(coordinator, idx) for idx, ent in enumerate(coordinator.data)
     # )
 
-    # Setup components
+    # Setup components, each platform adds the time it took to create its
+    # entities to the startup timings
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    _LOGGER.debug(
+        "Setup of %s took %.3f seconds: %s",
+        entry.title,
+        time.monotonic() - start,
+        ", ".join(
+            f"{phase} {duration:.3f}s"
+            for phase, duration in coordinator.startup_timings.items()
+        ),
+    )
     return True
 
 
@@ -76,61 +159,400 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted snapshot of a removed config entry."""
+    await Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}").async_remove()
+
+
+class LoadedStates(NamedTuple):
+    """Result of reading and processing the states file."""
+
+    signature: tuple[int, int, int]
+    digest: bytes | None
+    # the rest is None if the file contents did not change
+    data: Mapping[str, EnvelopeState] | None = None
+    history: HistoryStore | None = None
+    tree: EnvelopeTree | None = None
+    quarantine: Quarantine | None = None
+    values: Mapping[tuple[str, str], object] | None = None
+    timings: dict[str, float] | None = None
+    bytes_read: int = 0
+    records: int = 0
+
+
 class EnvelopeCoordinator(DataUpdateCoordinator):
     """envelope coordinator."""
 
-    def __init__(self, hass, state_file):
+    def __init__(self, hass, state_file, hash_contents=True):
         """Initialize my coordinator."""
         super().__init__(
             hass,
             _LOGGER,
             # Name of the data. For logging purposes.
             name="Budget Envelopes Coordinator?!",
-            # Polling interval. Will only be polled if there are subscribers.
-            update_interval=timedelta(seconds=180),
+            # No polling, refreshes are requested by the EnvelopeFileWatcher.
+            update_interval=None,
+            # Listeners are only called if the data changed, see
+            # async_update_listeners for which of them.
+            always_update=False,
         )
         self.state_file = state_file
         self.state_last_read = "now"
-        self.raw_states = None
-        self.data = {}
+        self.data = MappingProxyType({})
+        # all months of all envelopes, self.data only holds the latest ones
+        self.history = HistoryStore()
+        # parent/child links and rollups of the envelopes in self.data
+        self.tree = EnvelopeTree({})
+        # device of every envelope, shared by all entities of the envelope
+        self.devices: dict[str, DeviceInfo] = {}
+        # (key, value function) of the entity descriptions of the platforms
+        # and their values for every envelope, keyed by (envelope, key)
+        self.value_descriptions: tuple[tuple[str, Callable], ...] = ()
+        self.values = MappingProxyType({})
+
+        # change detection: (st_mtime_ns, st_size, st_ino) of the last parsed
+        # file and, optionally, a digest of its contents
+        self.hash_contents = hash_contents
+        self.file_signature = None
+        self.file_digest = None
+
+        # envelopes that changed with the last refresh, None for all of them
+        self.changed_envelopes = None
+        # envelopes that appeared or disappeared with the last refresh
+        self.added_envelopes = frozenset()
+        self.removed_envelopes = frozenset()
+        self._listeners_success = True
+
+        # debug counter of entity state writes skipped as nothing changed
+        self.suppressed_writes = 0
+
+        # seconds spent per phase by the last parse and during setup
+        self.timings = {}
+        self.startup_timings = {}
+
+        # diagnostics of the last refreshes
+        self.bytes_read = 0
+        self.records = 0
+        # invalid records skipped by the last parse
+        self.quarantine = Quarantine()
+        self.skipped_refreshes = 0
+
+        # since when the last good data is served as the file cannot be read
+        # or parsed, and the number of refreshes that failed since
+        self.stale_since = None
+        self.failed_refreshes = 0
+        self._unsub_retry = None
+
+        # latest month index per envelope imported into the statistics
+        self.imported_months: dict[str, int] = {}
+
+        # processed envelope table persisted for a fast startup
+        self._store = Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}.{self.config_entry.entry_id}"
+        )
+
+    async def async_restore_snapshot(self) -> bool:
+        """Use the persisted envelope table if the states file did not change.
+
+        The history is not persisted, a refresh is needed to rebuild it.
+        """
+        if (snapshot := await self._store.async_load()) is None:
+            return False
+
+        # the imported statistics do not depend on the file
+        self.imported_months = snapshot.get("imported", {})
+
+        digest = snapshot["digest"]
+        if not await self.hass.async_add_executor_job(
+            self.is_snapshot_current,
+            self.config_entry.data[CONF_FILE_PATH],
+            tuple(snapshot["signature"]),
+            digest and bytes.fromhex(digest),
+        ):
+            _LOGGER.debug("%s: persisted snapshot is outdated", self.name)
+            return False
+
+        self.data = MappingProxyType(
+            {
+                key: EnvelopeState.from_record(env)
+                for key, env in snapshot["data"].items()
+            }
+        )
+        self.tree = EnvelopeTree(snapshot["data"])
+        _LOGGER.debug(
+            "%s: restored %d envelopes from the persisted snapshot",
+            self.name,
+            len(self.data),
+        )
+        return True
 
-    def read_states(self):
-        "Reads the states from a file and preprocesses them."
+    @staticmethod
+    def is_snapshot_current(file_path, signature, digest) -> bool:
+        """Return True if the file still has a snapshot's signature or digest."""
+        try:
+            stat = os.stat(file_path)
+            if (stat.st_mtime_ns, stat.st_size, stat.st_ino) == signature:
+                return True
+            if digest is None:
+                return False
+            return contents_digest(file_path) == digest
+        except OSError:
+            return False
+
+    @callback
+    def async_set_value_descriptions(self, descriptions: Iterable) -> None:
+        """Precompute the values of entity descriptions with every refresh.
+
+        The descriptions need a key and a value function of an EnvelopeState.
+        """
+        value_descriptions = dict(self.value_descriptions)
+        value_descriptions.update(
+            (description.key, description.value) for description in descriptions
+        )
+        self.value_descriptions = tuple(value_descriptions.items())
+        self.values = self.compute_values(self.data, self.value_descriptions)
+
+    @staticmethod
+    def compute_values(data, value_descriptions):
+        """Return the values of the descriptions for all envelopes.
+
+        One pass over the descriptions per envelope, so the entities only
+        look up their value when their state is read.
+        """
+        return MappingProxyType(
+            {
+                (envelope, key): value(state)
+                for envelope, state in data.items()
+                for key, value in value_descriptions
+            }
+        )
 
-        with open(
-            self.config_entry.data[CONF_FILE_PATH], encoding="utf8"
-        ) as statesfile:
-            self.raw_states = json.loads("\n".join(statesfile.readlines()))
-        # self.raw_states = FILECONTENTS
+    @callback
+    def async_update_devices(
+        self, selected: Callable[[str], bool] | None = None
+    ) -> None:
+        """Create the devices of the selected envelopes without one yet.
+
+        The device of a sub-envelope is linked to the device of its closest
+        selected parent. The devices are registered parents first in one go,
+        so every device the entities refer to already exists when they are
+        added.
+        """
+        registry = dr.async_get(self.hass)
+        for node in self.tree:
+            if node.name in self.devices or (selected and not selected(node.name)):
+                continue
+            device = DeviceInfo(
+                identifiers={(DOMAIN, node.name)},
+                name=f"{node.name} Envelope",
+            )
+            parent = node.parent
+            while parent is not None and selected and not selected(parent.name):
+                parent = parent.parent
+            if parent is not None:
+                device["via_device"] = (DOMAIN, parent.name)
+            registry.async_get_or_create(
+                config_entry_id=self.config_entry.entry_id, **device
+            )
+            self.devices[node.name] = device
 
-    def process_states(self):
-        "kk."
-        if self.raw_states is None:
+    @callback
+    def _snapshot_to_store(self) -> dict:
+        """Return the current envelope table and its file key for storage."""
+        return {
+            "signature": list(self.file_signature),
+            "digest": self.file_digest and self.file_digest.hex(),
+            "data": {key: env.as_dict() for key, env in self.data.items()},
+            "imported": self.imported_months,
+        }
+
+    async def async_import_statistics(self) -> None:
+        """Import the months of the history that are new as statistics.
+
+        The statistics are external, one per envelope and field, and are
+        added in one batch per statistic.
+        """
+        if "recorder" not in self.hass.config.components:
             return
 
-        for env in self.raw_states:
-            if (
-                "carryover" not in env
-                or env["carryover"] is None
-                or math.isnan(env["carryover"])
-            ):
-                env["carryover"] = 0
-
-            if env["state"] > 0:
-                env["state_percentage"] = round(
-                    env["state"] / (env["budget"] + env["carryover"]) * 100, 2
-                )
-            else:
-                env["state_percentage"] = 0.0
+        # pylint: disable=import-outside-toplevel
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+        )
 
-            env["state"] = round(env["state"], 2)
-            env["carryover"] = round(env["carryover"], 2)
-            env["budget"] = round(env["budget"], 2)
+        # only needed with the recorder, kept out of the import of the
+        # integration
+        from .backfill import build_statistics
 
-            if env["envelope"] == "":
-                env["envelope"] = "All"
+        history = self.history
+        batches, imported = await self.hass.async_add_executor_job(
+            build_statistics,
+            history,
+            self.imported_months,
+            self.config_entry.options.get(CONF_CURRENCY, DEFAULT_CURRENCY),
+        )
+        if history is not self.history:
+            # refreshed meanwhile, the next import picks the new months up
+            return
+        for metadata, rows in batches:
+            async_add_external_statistics(self.hass, metadata, rows)
+        self.imported_months = imported
+        _LOGGER.debug(
+            "%s: imported %d statistics rows",
+            self.name,
+            sum(len(rows) for _, rows in batches),
+        )
+        self._store.async_delay_save(self._snapshot_to_store, SNAPSHOT_SAVE_DELAY)
 
-            self.data[env["envelope"]] = env
+    def read_states(self, file_path):
+        """Read the states from the file if it changed since the last read.
+
+        Runs in the executor. Returns None if the file is unchanged, otherwise
+        a tuple of the file signature and a JsonArrayReader over its records.
+        """
+        stat = os.stat(file_path)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if signature == self.file_signature:
+            return None
+
+        # the records are decoded while they are processed and hashed in the
+        # same pass, the file is read once and never held in memory as a whole
+        return signature, JsonArrayReader(
+            open(file_path, "rb"), digest=new_digest() if self.hash_contents else None
+        )
+
+    @staticmethod
+    def process_states(raw_states):
+        """Process the states records into a read-only envelope lookup table.
+
+        The records are consumed in a single pass, only the latest record of
+        every envelope is kept besides the compact history. Parents without a
+        record of their own get one with the rollup of their children.
+
+        Invalid records are put in quarantine instead, the other envelopes
+        are processed as usual.
+
+        Runs in the executor and builds new records instead of modifying the
+        current data, so entities never see a half-processed table. Returns
+        the table, the history of all months of all envelopes, the envelope
+        hierarchy and the quarantine.
+        """
+        history = HistoryStore()
+        quarantine = Quarantine()
+
+        # single pass for the latest month of every envelope, independent of
+        # the order of the records; the last record wins within a month
+        latest = {}
+        for index, raw in enumerate(raw_states):
+            if (error := validate_record(raw)) is not None:
+                envelope = raw.get("envelope") if isinstance(raw, dict) else None
+                quarantine.add(
+                    RecordError(
+                        index,
+                        envelope if isinstance(envelope, str) else None,
+                        *error,
+                    )
+                )
+                continue
+            envelope = raw["envelope"] or ROOT
+            month = -1
+            if "month" in raw:
+                month = month_index(raw["month"])
+                history.add(envelope, month, raw)
+            if month >= latest.get(envelope, (-1, None))[0]:
+                latest[envelope] = (month, raw)
+
+        history.finish()
+
+        latest = {envelope: raw for envelope, (_, raw) in latest.items()}
+        tree = EnvelopeTree(latest)
+        latest.update(tree.rollup_records())
+
+        # derived fields of the latest records, computed column by column
+        records = list(latest.values())
+        # the amounts are converted to integer cents once, a missing
+        # carryover counts as 0
+        columns = (
+            array("q", (to_cents(raw["state"]) for raw in records)),
+            array("q", (to_cents(raw["budget"]) for raw in records)),
+            array("q", (to_cents(raw.get("carryover")) for raw in records)),
+        )
+        percentages = derive_columns(*columns)
+
+        data = {}
+        for envelope, raw, state, budget, carryover, percentage in zip(
+            latest, records, *columns, percentages
+        ):
+            envelope = sys.intern(envelope)
+            data[envelope] = EnvelopeState(
+                envelope=envelope,
+                month=raw.get("month"),
+                state=from_cents(state),
+                budget=from_cents(budget),
+                carryover=from_cents(carryover),
+                # hundredths of a percent
+                state_percentage=percentage / 100,
+                adjustment=money(raw.get("adjustment")),
+                state_month=money(raw.get("state_month")),
+                rollup=raw.get("rollup", False),
+            )
+
+        return MappingProxyType(data), history, tree, quarantine
+
+    def _load_states(self, file_path, value_descriptions):
+        """Read and process the states file, the blocking part of a refresh."""
+        start = time.monotonic()
+        if (result := self.read_states(file_path)) is None:
+            return None
+
+        signature, reader = result
+        read = time.monotonic()
+        with reader.file:
+            data, history, tree, quarantine = self.process_states(reader)
+        digest = reader.digest and reader.digest.digest()
+        if digest is not None and digest == self.file_digest:
+            # the file is rewritten even if nothing changed, e.g. nightly runs
+            return LoadedStates(signature, digest, bytes_read=reader.bytes_read)
+        values = self.compute_values(data, value_descriptions)
+        processed = time.monotonic()
+
+        if quarantine:
+            _LOGGER.warning(
+                "Skipped %d invalid records of %s: %s",
+                quarantine.count,
+                file_path,
+                "; ".join(str(report) for report in quarantine.reports),
+            )
+        if processed - start > REFRESH_LATENCY_BUDGET:
+            _LOGGER.warning(
+                "Processing %s took %.3f seconds (budget %.3f seconds)",
+                file_path,
+                processed - start,
+                REFRESH_LATENCY_BUDGET,
+            )
+        # parsing and processing interleave, the reader times its share
+        timings = {
+            "read": read - start,
+            "parse": reader.parse_time,
+            "process": processed - read - reader.parse_time,
+        }
+        return LoadedStates(
+            signature,
+            digest,
+            data,
+            history,
+            tree,
+            quarantine,
+            values,
+            timings,
+            bytes_read=reader.bytes_read,
+            records=reader.items,
+        )
 
     async def _async_update_data(self):
         """Fetch data from API endpoint.
@@ -138,27 +560,179 @@ class EnvelopeCoordinator(DataUpdateCoordinator):
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
+        # the platforms may add descriptions while the file is processed
+        value_descriptions = self.value_descriptions
         try:
-            # Note: asyncio.TimeoutError and aiohttp.ClientError are already
-            # handled by the data update coordinator.
             async with async_timeout.timeout(10):
-                self.read_states()
-                self.process_states()
-                # Grab active context variables to limit data required to be fetched from API
-                # Note: using context is not required if there is no need or ability to limit
-                # data retrieved from API.
-                # listening_idx = set(self.async_contexts())
-
-                return self.data
-        except Exception as e:
-            print(e)
-            raise Exception()
-        # except ApiAuthError as err:
-        # Raising ConfigEntryAuthFailed will cancel future updates
-        # and start a config flow with SOURCE_REAUTH (async_step_reauth)
-        #    raise ConfigEntryAuthFailed from err
-        # except ApiError as err:
-        #    raise UpdateFailed(f"Error communicating with API: {err}")
+                result = await self.hass.async_add_executor_job(
+                    self._load_states,
+                    self.config_entry.data[CONF_FILE_PATH],
+                    value_descriptions,
+                )
+        except (json.JSONDecodeError, UnicodeDecodeError) as err:
+            # not valid JSON, most likely the producer is still writing it
+            return self._async_serve_stale(err, RETRY_MID_WRITE)
+        except (OSError, TimeoutError) as err:
+            # the file is missing or cannot be read in time; anything else is
+            # a bug and the coordinator logs it with its traceback
+            return self._async_serve_stale(err, RETRY_UNAVAILABLE)
+
+        was_stale = self._async_mark_fresh()
+
+        if result is None:
+            _LOGGER.debug("%s is unchanged, skipping parse", self.name)
+            self.skipped_refreshes += 1
+            self._async_update_unchanged(was_stale)
+            return self.data
+
+        # only remember the file once it was parsed successfully and swap the
+        # new table in as a whole
+        self.file_signature = result.signature
+        self.file_digest = result.digest
+        self.bytes_read = result.bytes_read
+        if (data := result.data) is None:
+            _LOGGER.debug("%s has unchanged contents, keeping the data", self.name)
+            self.skipped_refreshes += 1
+            self._async_update_unchanged(was_stale)
+            return self.data
+
+        self.history = result.history
+        self.tree = result.tree
+        self.values = result.values
+        if value_descriptions is not self.value_descriptions:
+            self.values = self.compute_values(data, self.value_descriptions)
+        self.timings = result.timings
+        self.records = result.records
+        self.quarantine = result.quarantine
+        self._store.async_delay_save(self._snapshot_to_store, SNAPSHOT_SAVE_DELAY)
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self.async_import_statistics(),
+            f"{DOMAIN} {self.config_entry.title} statistics",
+        )
+
+        previous = self.data
+        self.added_envelopes = frozenset(data.keys() - previous.keys())
+        self.removed_envelopes = frozenset(previous.keys() - data.keys())
+        # the entities of removed envelopes are removed instead of updated
+        self.changed_envelopes = frozenset(
+            key for key, env in data.items() if env != previous.get(key)
+        )
+        _LOGGER.debug(
+            "%s: %d of %d envelopes changed, %d added, %d removed",
+            self.name,
+            len(self.changed_envelopes),
+            len(data),
+            len(self.added_envelopes),
+            len(self.removed_envelopes),
+        )
+        if was_stale:
+            # all entities drop their stale attribute
+            self.changed_envelopes = None
+            if data == previous:
+                # not updated by the coordinator as the data is equal
+                self.async_update_listeners()
+        return data
+
+    @callback
+    def _async_serve_stale(self, err: Exception, delay: float):
+        """Keep the last good data after a failed refresh and retry later.
+
+        The retry delay starts at delay and doubles with every failed refresh
+        up to RETRY_MAX. Fails the refresh if there is no data to keep, the
+        setup of the config entry is retried or the file watcher refreshes
+        once the file is written.
+        """
+        file_path = self.config_entry.data[CONF_FILE_PATH]
+        if not self.data:
+            raise UpdateFailed(f"Cannot load {file_path}: {err!r}") from err
+
+        self.failed_refreshes += 1
+        delay = min(delay * 2 ** (self.failed_refreshes - 1), RETRY_MAX)
+        self.async_cancel_retry()
+        self._unsub_retry = async_call_later(self.hass, delay, self._async_retry)
+
+        if self.stale_since is None:
+            _LOGGER.warning(
+                "Cannot load %s, keeping the last good data: %r", file_path, err
+            )
+            self.stale_since = dt_util.utcnow()
+            # all entities add their stale attribute
+            self.changed_envelopes = None
+            self.async_update_listeners()
+        else:
+            _LOGGER.debug(
+                "Cannot load %s (%d failed refreshes, retry in %.2f seconds): %r",
+                file_path,
+                self.failed_refreshes,
+                delay,
+                err,
+            )
+            self._async_update_diagnostics()
+        return self.data
+
+    @callback
+    def _async_mark_fresh(self) -> bool:
+        """Reset the retries after a successful refresh, return if it was stale."""
+        self.async_cancel_retry()
+        if self.failed_refreshes:
+            _LOGGER.debug(
+                "%s: loaded after %d failed refreshes",
+                self.name,
+                self.failed_refreshes,
+            )
+        self.failed_refreshes = 0
+        was_stale = self.stale_since is not None
+        self.stale_since = None
+        return was_stale
+
+    @callback
+    def _async_update_unchanged(self, was_stale: bool) -> None:
+        """Update the listeners after a refresh without new data."""
+        if was_stale:
+            # the data did not change, but it is no longer stale
+            self.changed_envelopes = None
+            self.async_update_listeners()
+        else:
+            self._async_update_diagnostics()
+
+    @callback
+    def _async_retry(self, _now) -> None:
+        """Retry a failed refresh."""
+        self._unsub_retry = None
+        self.hass.async_create_task(self.async_refresh())
+
+    @callback
+    def async_cancel_retry(self) -> None:
+        """Cancel a scheduled retry."""
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners of the envelopes that changed.
+
+        Entities pass their envelope as context, listeners without a context
+        are always updated. All listeners are updated if the availability
+        changed or it is not known which envelopes changed.
+        """
+        changed, self.changed_envelopes = self.changed_envelopes, None
+        if changed is None or self.last_update_success != self._listeners_success:
+            self._listeners_success = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context is DIAGNOSTICS or context in changed:
+                update_callback()
+
+    @callback
+    def _async_update_diagnostics(self) -> None:
+        """Update the diagnostic entities after a refresh without new data."""
+        for update_callback, context in list(self._listeners.values()):
+            if context is DIAGNOSTICS:
+                update_callback()
 
 
 class BudgetEnvelopeBaseEntity(CoordinatorEntity):
@@ -168,16 +742,12 @@ class BudgetEnvelopeBaseEntity(CoordinatorEntity):
     _attr_attribution = (
         "Data read from the .json with specified format and storage location by"
     )
-
     def __init__(self, coordinator, idx):
         """Pass coordinator to CoordinatorEntity."""
         super().__init__(coordinator, context=idx)
         self.index = idx
 
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, f"{self.data['envelope']}")},
-            name=f"{self.data['envelope']} Envelope",
-        )
+        self._attr_device_info = coordinator.devices[idx]
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -194,1327 +764,3 @@ class BudgetEnvelopeBaseEntity(CoordinatorEntity):
     def data(self):
         """Shortcut to access coordinator data for the entity."""
         return self.coordinator.data[self.index]
-
-
-FILECONTENTS = [
-    {
-        "envelope": "",
-        "month": "2023-11",
-        "budget": 10458.0,
-        "state_month": 729.0,
-        "state": -9685.0,
-        "carryover": -10413.92,
-    },
-    {
-        "envelope": "",
-        "month": "2023-12",
-        "budget": 116.0,
-        "state_month": -10604.0,
-        "state": -20289.0,
-        "carryover": -9685.17,
-    },
-    {
-        "envelope": "",
-        "month": "2024-01",
-        "budget": 10521.0,
-        "state_month": 5287.0,
-        "state": -15002.0,
-        "carryover": -20289.04,
-    },
-    {
-        "envelope": "Auto",
-        "month": "2023-10",
-        "budget": 541.0,
-        "state_month": 66.0,
-        "state": 66.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Auto",
-        "month": "2023-11",
-        "budget": 541.0,
-        "state_month": -75.0,
-        "state": -9.0,
-        "carryover": 65.67000000000002,
-    },
-    {
-        "envelope": "Auto",
-        "month": "2023-12",
-        "budget": 541.0,
-        "state_month": -36.0,
-        "state": -45.0,
-        "carryover": -9.180000000000007,
-    },
-    {
-        "envelope": "Auto",
-        "month": "2024-01",
-        "budget": 541.0,
-        "state_month": 191.0,
-        "state": 146.0,
-        "carryover": -45.23999999999995,
-    },
-    {
-        "envelope": "Auto:Darlehen",
-        "month": "2023-10",
-        "budget": 350.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Auto:Darlehen",
-        "month": "2023-11",
-        "budget": 350.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Auto:Darlehen",
-        "month": "2023-12",
-        "budget": 350.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Auto:Darlehen",
-        "month": "2024-01",
-        "budget": 350.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Auto:Laden",
-        "month": "2023-10",
-        "budget": 40.0,
-        "state_month": 35.0,
-        "state": 35.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Auto:Laden",
-        "month": "2023-11",
-        "budget": 40.0,
-        "state_month": -83.0,
-        "state": -48.0,
-        "carryover": 34.57,
-    },
-    {
-        "envelope": "Auto:Laden",
-        "month": "2023-12",
-        "budget": 40.0,
-        "state_month": -5.0,
-        "state": -54.0,
-        "carryover": -48.279999999999994,
-    },
-    {
-        "envelope": "Auto:Laden",
-        "month": "2024-01",
-        "budget": 40.0,
-        "state_month": 40.0,
-        "state": -14.0,
-        "carryover": -53.50999999999999,
-    },
-    {
-        "envelope": "Auto:Parking",
-        "month": "2023-10",
-        "budget": 15.0,
-        "state_month": -22.0,
-        "state": -22.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Auto:Parking",
-        "month": "2023-11",
-        "budget": 15.0,
-        "state_month": 13.0,
-        "state": -9.0,
-        "carryover": -21.9,
-    },
-    {
-        "envelope": "Auto:Parking",
-        "month": "2023-12",
-        "budget": 15.0,
-        "state_month": -26.0,
-        "state": -35.0,
-        "carryover": -8.899999999999999,
-    },
-    {
-        "envelope": "Auto:Parking",
-        "month": "2024-01",
-        "budget": 15.0,
-        "state_month": 15.0,
-        "state": -20.0,
-        "carryover": -34.73,
-    },
-    {
-        "envelope": "Bildung",
-        "month": "2023-11",
-        "budget": 90.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Bildung",
-        "month": "2023-12",
-        "budget": 90.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Bildung",
-        "month": "2024-01",
-        "budget": 90.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Bildung:Kinder",
-        "month": "2023-11",
-        "budget": 90.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Bildung:Kinder",
-        "month": "2023-12",
-        "budget": 90.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Bildung:Kinder",
-        "month": "2024-01",
-        "budget": 90.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "B\u00fcrokratie",
-        "month": "2023-10",
-        "budget": 1263.0,
-        "state_month": 21.0,
-        "state": 21.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "B\u00fcrokratie",
-        "month": "2023-11",
-        "budget": 1263.0,
-        "state_month": 21.0,
-        "state": 42.0,
-        "carryover": 21.190000000000055,
-    },
-    {
-        "envelope": "B\u00fcrokratie",
-        "month": "2023-12",
-        "budget": 1263.0,
-        "state_month": -50.0,
-        "state": -8.0,
-        "carryover": 42.38000000000011,
-    },
-    {
-        "envelope": "B\u00fcrokratie",
-        "month": "2024-01",
-        "budget": 1263.0,
-        "state_month": 32.0,
-        "state": 24.0,
-        "carryover": -7.6099999999999,
-    },
-    {
-        "envelope": "B\u00fcrokratie:Banken",
-        "month": "2023-10",
-        "budget": 21.0,
-        "state_month": 21.0,
-        "state": 21.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "B\u00fcrokratie:Banken",
-        "month": "2023-11",
-        "budget": 21.0,
-        "state_month": 21.0,
-        "state": 42.0,
-        "carryover": 21.0,
-    },
-    {
-        "envelope": "B\u00fcrokratie:Banken",
-        "month": "2023-12",
-        "budget": 21.0,
-        "state_month": -50.0,
-        "state": -8.0,
-        "carryover": 42.0,
-    },
-    {
-        "envelope": "B\u00fcrokratie:Banken",
-        "month": "2024-01",
-        "budget": 21.0,
-        "state_month": 21.0,
-        "state": 13.0,
-        "carryover": -8.179999999999993,
-    },
-    {
-        "envelope": "B\u00fcrokratie:Steuer",
-        "month": "2023-10",
-        "budget": 1150.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "B\u00fcrokratie:Steuer",
-        "month": "2023-11",
-        "budget": 1150.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "B\u00fcrokratie:Steuer",
-        "month": "2023-12",
-        "budget": 1150.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "B\u00fcrokratie:Steuer",
-        "month": "2024-01",
-        "budget": 1150.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "B\u00fcrokratie:Versicherungen",
-        "month": "2023-10",
-        "budget": 92.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "B\u00fcrokratie:Versicherungen",
-        "month": "2023-11",
-        "budget": 92.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.18999999999999773,
-    },
-    {
-        "envelope": "B\u00fcrokratie:Versicherungen",
-        "month": "2023-12",
-        "budget": 92.0,
-        "state_month": 0.0,
-        "state": 1.0,
-        "carryover": 0.37999999999999545,
-    },
-    {
-        "envelope": "B\u00fcrokratie:Versicherungen",
-        "month": "2024-01",
-        "budget": 92.0,
-        "state_month": 11.0,
-        "state": 12.0,
-        "carryover": 0.5699999999999932,
-    },
-    {
-        "envelope": "Freizeit",
-        "month": "2023-10",
-        "budget": 265.0,
-        "state_month": 73.0,
-        "state": 73.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Freizeit",
-        "month": "2023-11",
-        "budget": 265.0,
-        "state_month": -30.0,
-        "state": 43.0,
-        "carryover": 73.35000000000002,
-    },
-    {
-        "envelope": "Freizeit",
-        "month": "2023-12",
-        "budget": 96.0,
-        "state_month": -96.0,
-        "state": -53.0,
-        "carryover": 43.0,
-    },
-    {
-        "envelope": "Freizeit",
-        "month": "2024-01",
-        "budget": 265.0,
-        "state_month": -103.0,
-        "state": -156.0,
-        "carryover": -53.39999999999998,
-    },
-    {
-        "envelope": "Freizeit:Ausgehen",
-        "month": "2023-10",
-        "budget": 150.0,
-        "state_month": 31.0,
-        "state": 31.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Freizeit:Ausgehen",
-        "month": "2023-11",
-        "budget": 150.0,
-        "state_month": -12.0,
-        "state": 18.0,
-        "carryover": 30.700000000000003,
-    },
-    {
-        "envelope": "Freizeit:Ausgehen",
-        "month": "2023-12",
-        "budget": 71.0,
-        "state_month": -18.0,
-        "state": -0.0,
-        "carryover": 18.200000000000003,
-    },
-    {
-        "envelope": "Freizeit:Ausgehen",
-        "month": "2024-01",
-        "budget": 150.0,
-        "state_month": 150.0,
-        "state": 150.0,
-        "carryover": -0.269999999999996,
-    },
-    {
-        "envelope": "Freizeit:Kinder",
-        "month": "2023-10",
-        "budget": 40.0,
-        "state_month": 26.0,
-        "state": 26.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Freizeit:Kinder",
-        "month": "2023-11",
-        "budget": 40.0,
-        "state_month": -42.0,
-        "state": -16.0,
-        "carryover": 25.5,
-    },
-    {
-        "envelope": "Freizeit:Kinder",
-        "month": "2023-12",
-        "budget": 40.0,
-        "state_month": 20.0,
-        "state": 4.0,
-        "carryover": -16.400000000000006,
-    },
-    {
-        "envelope": "Freizeit:Kinder",
-        "month": "2024-01",
-        "budget": 40.0,
-        "state_month": 40.0,
-        "state": 44.0,
-        "carryover": 3.7999999999999936,
-    },
-    {
-        "envelope": "Freizeit:Kultur",
-        "month": "2023-10",
-        "budget": 40.0,
-        "state_month": 40.0,
-        "state": 40.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Freizeit:Kultur",
-        "month": "2023-11",
-        "budget": 40.0,
-        "state_month": 40.0,
-        "state": 80.0,
-        "carryover": 40.0,
-    },
-    {
-        "envelope": "Freizeit:Kultur",
-        "month": "2024-01",
-        "budget": 40.0,
-        "state_month": 40.0,
-        "state": 40.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Freizeit:Medien",
-        "month": "2023-10",
-        "budget": 35.0,
-        "state_month": -13.0,
-        "state": -13.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Freizeit:Medien",
-        "month": "2023-11",
-        "budget": 35.0,
-        "state_month": 16.0,
-        "state": 3.0,
-        "carryover": -12.849999999999994,
-    },
-    {
-        "envelope": "Freizeit:Medien",
-        "month": "2023-12",
-        "budget": 35.0,
-        "state_month": 16.0,
-        "state": 19.0,
-        "carryover": 3.2000000000000064,
-    },
-    {
-        "envelope": "Freizeit:Medien",
-        "month": "2024-01",
-        "budget": 35.0,
-        "state_month": 35.0,
-        "state": 54.0,
-        "carryover": 19.250000000000007,
-    },
-    {
-        "envelope": "Gesundheit",
-        "month": "2023-10",
-        "budget": 1160.0,
-        "state_month": -127.0,
-        "state": -127.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Gesundheit",
-        "month": "2023-11",
-        "budget": 660.0,
-        "state_month": 116.0,
-        "state": -11.0,
-        "carryover": -126.84999999999991,
-    },
-    {
-        "envelope": "Gesundheit",
-        "month": "2023-12",
-        "budget": 944.0,
-        "state_month": -36.0,
-        "state": -46.0,
-        "carryover": -10.589999999999918,
-    },
-    {
-        "envelope": "Gesundheit",
-        "month": "2024-01",
-        "budget": 1223.0,
-        "state_month": 1223.0,
-        "state": 1177.0,
-        "carryover": -46.08999999999992,
-    },
-    {
-        "envelope": "Gesundheit:Arzt",
-        "month": "2023-10",
-        "budget": 100.0,
-        "state_month": -180.0,
-        "state": -180.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Gesundheit:Arzt",
-        "month": "2023-11",
-        "budget": 332.0,
-        "state_month": 116.0,
-        "state": -64.0,
-        "carryover": -180.14999999999998,
-    },
-    {
-        "envelope": "Gesundheit:Arzt",
-        "month": "2023-12",
-        "budget": 403.0,
-        "state_month": 64.0,
-        "state": -0.0,
-        "carryover": -63.889999999999986,
-    },
-    {
-        "envelope": "Gesundheit:Arzt",
-        "month": "2024-01",
-        "budget": 100.0,
-        "state_month": 100.0,
-        "state": 100.0,
-        "carryover": -0.2899999999999636,
-    },
-    {
-        "envelope": "Gesundheit:Krankenversicherung",
-        "month": "2023-10",
-        "budget": 1060.0,
-        "state_month": 65.0,
-        "state": 65.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Gesundheit:Krankenversicherung",
-        "month": "2023-11",
-        "budget": 328.0,
-        "state_month": 0.0,
-        "state": 65.0,
-        "carryover": 65.39999999999998,
-    },
-    {
-        "envelope": "Gesundheit:Krankenversicherung",
-        "month": "2023-12",
-        "budget": 541.0,
-        "state_month": -55.0,
-        "state": 10.0,
-        "carryover": 65.39999999999998,
-    },
-    {
-        "envelope": "Gesundheit:Krankenversicherung",
-        "month": "2024-01",
-        "budget": 1123.0,
-        "state_month": 1123.0,
-        "state": 1133.0,
-        "carryover": 10.399999999999977,
-    },
-    {
-        "envelope": "Haushalt",
-        "month": "2023-10",
-        "budget": 1820.0,
-        "state_month": -270.0,
-        "state": -270.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Haushalt",
-        "month": "2023-11",
-        "budget": 1820.0,
-        "state_month": 109.0,
-        "state": -161.0,
-        "carryover": -269.6399999999999,
-    },
-    {
-        "envelope": "Haushalt",
-        "month": "2023-12",
-        "budget": 2026.0,
-        "state_month": 87.0,
-        "state": -74.0,
-        "carryover": -160.56999999999994,
-    },
-    {
-        "envelope": "Haushalt",
-        "month": "2024-01",
-        "budget": 1820.0,
-        "state_month": 1820.0,
-        "state": 1746.0,
-        "carryover": -73.95000000000005,
-    },
-    {
-        "envelope": "Haushalt:Bekleidung",
-        "month": "2023-10",
-        "budget": 100.0,
-        "state_month": 96.0,
-        "state": 96.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Haushalt:Bekleidung",
-        "month": "2023-11",
-        "budget": 100.0,
-        "state_month": -50.0,
-        "state": 46.0,
-        "carryover": 96.03999999999999,
-    },
-    {
-        "envelope": "Haushalt:Bekleidung",
-        "month": "2023-12",
-        "budget": 100.0,
-        "state_month": -70.0,
-        "state": -24.0,
-        "carryover": 45.66,
-    },
-    {
-        "envelope": "Haushalt:Bekleidung",
-        "month": "2024-01",
-        "budget": 100.0,
-        "state_month": 100.0,
-        "state": 76.0,
-        "carryover": -24.140000000000015,
-    },
-    {
-        "envelope": "Haushalt:En Gros",
-        "month": "2023-10",
-        "budget": 30.0,
-        "state_month": -117.0,
-        "state": -117.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Haushalt:En Gros",
-        "month": "2023-11",
-        "budget": 30.0,
-        "state_month": 30.0,
-        "state": -87.0,
-        "carryover": -117.30000000000001,
-    },
-    {
-        "envelope": "Haushalt:En Gros",
-        "month": "2023-12",
-        "budget": 30.0,
-        "state_month": 30.0,
-        "state": -57.0,
-        "carryover": -87.30000000000001,
-    },
-    {
-        "envelope": "Haushalt:En Gros",
-        "month": "2024-01",
-        "budget": 30.0,
-        "state_month": 30.0,
-        "state": -27.0,
-        "carryover": -57.30000000000001,
-    },
-    {
-        "envelope": "Haushalt:Kinder",
-        "month": "2023-10",
-        "budget": 170.0,
-        "state_month": -40.0,
-        "state": -40.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Haushalt:Kinder",
-        "month": "2023-11",
-        "budget": 170.0,
-        "state_month": 86.0,
-        "state": 46.0,
-        "carryover": -39.53,
-    },
-    {
-        "envelope": "Haushalt:Kinder",
-        "month": "2023-12",
-        "budget": 286.0,
-        "state_month": -77.0,
-        "state": -31.0,
-        "carryover": 46.42,
-    },
-    {
-        "envelope": "Haushalt:Kinder",
-        "month": "2024-01",
-        "budget": 170.0,
-        "state_month": 170.0,
-        "state": 139.0,
-        "carryover": -30.91000000000004,
-    },
-    {
-        "envelope": "Haushalt:Lebensmittel",
-        "month": "2023-10",
-        "budget": 1250.0,
-        "state_month": -216.0,
-        "state": -216.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Haushalt:Lebensmittel",
-        "month": "2023-11",
-        "budget": 1250.0,
-        "state_month": -8.0,
-        "state": -225.0,
-        "carryover": -216.3499999999999,
-    },
-    {
-        "envelope": "Haushalt:Lebensmittel",
-        "month": "2023-12",
-        "budget": 1250.0,
-        "state_month": 181.0,
-        "state": -44.0,
-        "carryover": -224.68999999999983,
-    },
-    {
-        "envelope": "Haushalt:Lebensmittel",
-        "month": "2024-01",
-        "budget": 1250.0,
-        "state_month": 1250.0,
-        "state": 1206.0,
-        "carryover": -43.539999999999736,
-    },
-    {
-        "envelope": "Haushalt:Sonstiges",
-        "month": "2023-10",
-        "budget": 70.0,
-        "state_month": -71.0,
-        "state": -71.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Haushalt:Sonstiges",
-        "month": "2023-11",
-        "budget": 70.0,
-        "state_month": 48.0,
-        "state": -23.0,
-        "carryover": -71.44999999999999,
-    },
-    {
-        "envelope": "Haushalt:Sonstiges",
-        "month": "2023-12",
-        "budget": 70.0,
-        "state_month": -43.0,
-        "state": -66.0,
-        "carryover": -23.19999999999999,
-    },
-    {
-        "envelope": "Haushalt:Sonstiges",
-        "month": "2024-01",
-        "budget": 70.0,
-        "state_month": 70.0,
-        "state": 4.0,
-        "carryover": -65.99999999999999,
-    },
-    {
-        "envelope": "Privat",
-        "month": "2023-10",
-        "budget": 230.0,
-        "state_month": -82.0,
-        "state": -82.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Privat",
-        "month": "2023-11",
-        "budget": 730.0,
-        "state_month": 227.0,
-        "state": 145.0,
-        "carryover": -82.30000000000001,
-    },
-    {
-        "envelope": "Privat",
-        "month": "2023-12",
-        "budget": 330.0,
-        "state_month": -168.0,
-        "state": -23.0,
-        "carryover": 144.52000000000004,
-    },
-    {
-        "envelope": "Privat",
-        "month": "2024-01",
-        "budget": 230.0,
-        "state_month": 230.0,
-        "state": 207.0,
-        "carryover": -23.049999999999955,
-    },
-    {
-        "envelope": "Privat:Geschenke",
-        "month": "2023-10",
-        "budget": 130.0,
-        "state_month": -102.0,
-        "state": -102.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Privat:Geschenke",
-        "month": "2023-11",
-        "budget": 630.0,
-        "state_month": 270.0,
-        "state": 168.0,
-        "carryover": -101.75,
-    },
-    {
-        "envelope": "Privat:Geschenke",
-        "month": "2023-12",
-        "budget": 230.0,
-        "state_month": -164.0,
-        "state": 4.0,
-        "carryover": 168.37,
-    },
-    {
-        "envelope": "Privat:Geschenke",
-        "month": "2024-01",
-        "budget": 130.0,
-        "state_month": 130.0,
-        "state": 134.0,
-        "carryover": 4.399999999999977,
-    },
-    {
-        "envelope": "Privat:Werbungskosten",
-        "month": "2023-10",
-        "budget": 100.0,
-        "state_month": 19.0,
-        "state": 19.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Privat:Werbungskosten",
-        "month": "2023-11",
-        "budget": 100.0,
-        "state_month": -43.0,
-        "state": -24.0,
-        "carryover": 19.450000000000003,
-    },
-    {
-        "envelope": "Privat:Werbungskosten",
-        "month": "2023-12",
-        "budget": 100.0,
-        "state_month": 36.0,
-        "state": 13.0,
-        "carryover": -23.85000000000001,
-    },
-    {
-        "envelope": "Privat:Werbungskosten",
-        "month": "2024-01",
-        "budget": 100.0,
-        "state_month": 100.0,
-        "state": 113.0,
-        "carryover": 12.54999999999999,
-    },
-    {
-        "envelope": "Privat:Werbungskosten:Essen+Kaffee",
-        "month": "2023-10",
-        "budget": 100.0,
-        "state_month": 19.0,
-        "state": 19.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Privat:Werbungskosten:Essen+Kaffee",
-        "month": "2023-11",
-        "budget": 100.0,
-        "state_month": -43.0,
-        "state": -24.0,
-        "carryover": 19.450000000000003,
-    },
-    {
-        "envelope": "Privat:Werbungskosten:Essen+Kaffee",
-        "month": "2023-12",
-        "budget": 100.0,
-        "state_month": 36.0,
-        "state": 13.0,
-        "carryover": -23.85000000000001,
-    },
-    {
-        "envelope": "Privat:Werbungskosten:Essen+Kaffee",
-        "month": "2024-01",
-        "budget": 100.0,
-        "state_month": 100.0,
-        "state": 113.0,
-        "carryover": 12.54999999999999,
-    },
-    {
-        "envelope": "Umbuchung",
-        "month": "2023-10",
-        "budget": 1630.0,
-        "state_month": 100.0,
-        "state": 100.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Umbuchung",
-        "month": "2023-11",
-        "budget": 1630.0,
-        "state_month": 100.0,
-        "state": 200.0,
-        "carryover": 100.0,
-    },
-    {
-        "envelope": "Umbuchung",
-        "month": "2023-12",
-        "budget": 1746.0,
-        "state_month": -198.0,
-        "state": 2.0,
-        "carryover": 200.0,
-    },
-    {
-        "envelope": "Umbuchung",
-        "month": "2024-01",
-        "budget": 1630.0,
-        "state_month": 1390.0,
-        "state": 1392.0,
-        "carryover": 2.4700000000000273,
-    },
-    {
-        "envelope": "Umbuchung:R\u00fcckstellungen",
-        "month": "2023-10",
-        "budget": 230.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Umbuchung:R\u00fcckstellungen",
-        "month": "2023-11",
-        "budget": 230.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Umbuchung:R\u00fcckstellungen",
-        "month": "2023-12",
-        "budget": 230.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Umbuchung:R\u00fcckstellungen",
-        "month": "2024-01",
-        "budget": 230.0,
-        "state_month": -10.0,
-        "state": -10.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Umbuchung:Sparen",
-        "month": "2023-10",
-        "budget": 1100.0,
-        "state_month": 100.0,
-        "state": 100.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Umbuchung:Sparen",
-        "month": "2023-11",
-        "budget": 1100.0,
-        "state_month": 100.0,
-        "state": 200.0,
-        "carryover": 100.0,
-    },
-    {
-        "envelope": "Umbuchung:Sparen",
-        "month": "2023-12",
-        "budget": 1216.0,
-        "state_month": -200.0,
-        "state": -0.0,
-        "carryover": 200.0,
-    },
-    {
-        "envelope": "Umbuchung:Sparen",
-        "month": "2024-01",
-        "budget": 1100.0,
-        "state_month": 1100.0,
-        "state": 1100.0,
-        "carryover": -0.11999999999989086,
-    },
-    {
-        "envelope": "Umbuchung:Taschengeld",
-        "month": "2023-10",
-        "budget": 300.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Umbuchung:Taschengeld",
-        "month": "2023-11",
-        "budget": 300.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Umbuchung:Taschengeld",
-        "month": "2023-12",
-        "budget": 300.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Umbuchung:Taschengeld",
-        "month": "2024-01",
-        "budget": 300.0,
-        "state_month": 300.0,
-        "state": 300.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Urlaub",
-        "month": "2023-10",
-        "budget": 250.0,
-        "state_month": 24.0,
-        "state": 24.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Urlaub",
-        "month": "2023-11",
-        "budget": 250.0,
-        "state_month": 250.0,
-        "state": 274.0,
-        "carryover": 23.80000000000001,
-    },
-    {
-        "envelope": "Urlaub",
-        "month": "2023-12",
-        "budget": 250.0,
-        "state_month": 250.0,
-        "state": 524.0,
-        "carryover": 273.8,
-    },
-    {
-        "envelope": "Urlaub",
-        "month": "2024-01",
-        "budget": 250.0,
-        "state_month": 250.0,
-        "state": 774.0,
-        "carryover": 523.8,
-    },
-    {
-        "envelope": "Verkehrsmittel",
-        "month": "2023-10",
-        "budget": 70.0,
-        "state_month": -25.0,
-        "state": -25.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Verkehrsmittel",
-        "month": "2023-11",
-        "budget": 70.0,
-        "state_month": 20.0,
-        "state": -5.0,
-        "carryover": -25.299999999999997,
-    },
-    {
-        "envelope": "Verkehrsmittel",
-        "month": "2023-12",
-        "budget": 70.0,
-        "state_month": 13.0,
-        "state": 9.0,
-        "carryover": -4.8999999999999915,
-    },
-    {
-        "envelope": "Verkehrsmittel",
-        "month": "2024-01",
-        "budget": 70.0,
-        "state_month": 70.0,
-        "state": 79.0,
-        "carryover": 8.500000000000014,
-    },
-    {
-        "envelope": "Wohnen",
-        "month": "2023-10",
-        "budget": 2987.0,
-        "state_month": 22.0,
-        "state": 22.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Wohnen",
-        "month": "2023-11",
-        "budget": 3139.0,
-        "state_month": 10.0,
-        "state": 32.0,
-        "carryover": 22.159999999999854,
-    },
-    {
-        "envelope": "Wohnen",
-        "month": "2023-12",
-        "budget": 3218.0,
-        "state_month": 87.0,
-        "state": 120.0,
-        "carryover": 32.36999999999989,
-    },
-    {
-        "envelope": "Wohnen",
-        "month": "2024-01",
-        "budget": 3139.0,
-        "state_month": 184.0,
-        "state": 304.0,
-        "carryover": 119.52999999999975,
-    },
-    {
-        "envelope": "Wohnen:Bekleidung",
-        "month": "2023-12",
-        "budget": 20.0,
-        "state_month": 20.0,
-        "state": 20.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Wohnen:Haushaltsger\u00e4te",
-        "month": "2023-10",
-        "budget": 17.0,
-        "state_month": 17.0,
-        "state": 17.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Wohnen:Haushaltsger\u00e4te",
-        "month": "2023-11",
-        "budget": 17.0,
-        "state_month": 17.0,
-        "state": 34.0,
-        "carryover": 17.0,
-    },
-    {
-        "envelope": "Wohnen:Haushaltsger\u00e4te",
-        "month": "2023-12",
-        "budget": 17.0,
-        "state_month": 17.0,
-        "state": 51.0,
-        "carryover": 34.0,
-    },
-    {
-        "envelope": "Wohnen:Haushaltsger\u00e4te",
-        "month": "2024-01",
-        "budget": 17.0,
-        "state_month": 17.0,
-        "state": 68.0,
-        "carryover": 51.0,
-    },
-    {
-        "envelope": "Wohnen:Inneneinrichtung",
-        "month": "2023-10",
-        "budget": 50.0,
-        "state_month": 1.0,
-        "state": 1.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Wohnen:Inneneinrichtung",
-        "month": "2023-11",
-        "budget": 50.0,
-        "state_month": 8.0,
-        "state": 9.0,
-        "carryover": 0.7999999999999972,
-    },
-    {
-        "envelope": "Wohnen:Inneneinrichtung",
-        "month": "2023-12",
-        "budget": 50.0,
-        "state_month": -11.0,
-        "state": -2.0,
-        "carryover": 8.899999999999999,
-    },
-    {
-        "envelope": "Wohnen:Inneneinrichtung",
-        "month": "2024-01",
-        "budget": 50.0,
-        "state_month": 50.0,
-        "state": 48.0,
-        "carryover": -2.4499999999999957,
-    },
-    {
-        "envelope": "Wohnen:Instandhaltung",
-        "month": "2023-10",
-        "budget": 17.0,
-        "state_month": 17.0,
-        "state": 17.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Wohnen:Instandhaltung",
-        "month": "2023-11",
-        "budget": 17.0,
-        "state_month": 17.0,
-        "state": 34.0,
-        "carryover": 17.0,
-    },
-    {
-        "envelope": "Wohnen:Instandhaltung",
-        "month": "2023-12",
-        "budget": 17.0,
-        "state_month": 17.0,
-        "state": 51.0,
-        "carryover": 34.0,
-    },
-    {
-        "envelope": "Wohnen:Instandhaltung",
-        "month": "2024-01",
-        "budget": 17.0,
-        "state_month": 17.0,
-        "state": 68.0,
-        "carryover": 51.0,
-    },
-    {
-        "envelope": "Wohnen:Miete",
-        "month": "2023-10",
-        "budget": 2710.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Wohnen:Miete",
-        "month": "2023-11",
-        "budget": 2862.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Wohnen:Miete",
-        "month": "2023-12",
-        "budget": 2862.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Wohnen:Miete",
-        "month": "2024-01",
-        "budget": 2862.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Wohnen:Nebenkosten",
-        "month": "2023-10",
-        "budget": 93.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Wohnen:Nebenkosten",
-        "month": "2023-11",
-        "budget": 93.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Wohnen:Nebenkosten",
-        "month": "2023-12",
-        "budget": 93.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Wohnen:Nebenkosten",
-        "month": "2024-01",
-        "budget": 93.0,
-        "state_month": 0.0,
-        "state": 0.0,
-        "carryover": 0.0,
-    },
-    {
-        "envelope": "Wohnen:Telefon+Internet",
-        "month": "2023-10",
-        "budget": 100.0,
-        "state_month": -13.0,
-        "state": -13.0,
-        "carryover": None,
-    },
-    {
-        "envelope": "Wohnen:Telefon+Internet",
-        "month": "2023-11",
-        "budget": 100.0,
-        "state_month": -32.0,
-        "state": -45.0,
-        "carryover": -12.64,
-    },
-    {
-        "envelope": "Wohnen:Telefon+Internet",
-        "month": "2023-12",
-        "budget": 159.0,
-        "state_month": 45.0,
-        "state": -0.0,
-        "carryover": -44.52999999999999,
-    },
-    {
-        "envelope": "Wohnen:Telefon+Internet",
-        "month": "2024-01",
-        "budget": 100.0,
-        "state_month": 100.0,
-        "state": 100.0,
-        "carryover": -0.01999999999998181,
-    },
-]
@@ -0,0 +1,80 @@
+"""Backfill of the envelope history into long-term statistics."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+from .history import HistoryStore, month_index
+
+# fields of the history imported as statistics and their names
+STATISTIC_FIELDS = {
+    "state": "Balance",
+    "state_month": "Monthly balance",
+    "budget": "Budget",
+    "carryover": "Carryover",
+}
+
+
+def statistic_id(envelope: str, field: str) -> str:
+    """Return the id of the external statistic of an envelope field."""
+    return f"{DOMAIN}:{slugify(envelope)}_{field}"
+
+
+def month_end(month: int) -> datetime:
+    """Return the start of the last hour of a month index, in UTC.
+
+    Statistics start at the full hour, the local time zone may be offset by
+    less than an hour.
+    """
+    year, month_of_year = divmod(month + 1, 12)
+    end = datetime(year, month_of_year + 1, 1, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return (end - timedelta(hours=1)).astimezone(timezone.utc).replace(minute=0)
+
+
+def build_statistics(
+    history: HistoryStore, imported: dict[str, int], currency: str
+) -> tuple[list[tuple[dict, list[dict]]], dict[str, int]]:
+    """Return the statistics of the months not imported yet.
+
+    Runs in the executor. imported holds the latest month index imported per
+    envelope, that month is imported again as it may not have been over.
+    Returns a (metadata, rows) batch per statistic and the months imported.
+    """
+    # the month in progress is stamped with the current hour, the recorder
+    # would otherwise hold a statistic from the future until the month is over
+    now = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    batches = []
+    imported = dict(imported)
+    for envelope in history.envelopes():
+        since = imported.get(envelope, -1)
+        latest = since
+        for field, name in STATISTIC_FIELDS.items():
+            rows = []
+            for label, value in history.series(envelope, field):
+                if (month := month_index(label)) < since:
+                    continue
+                latest = max(latest, month)
+                rows.append(
+                    {
+                        "start": min(month_end(month), now),
+                        "state": value,
+                        "mean": value,
+                        "min": value,
+                        "max": value,
+                    }
+                )
+            if not rows:
+                continue
+            metadata = {
+                "source": DOMAIN,
+                "statistic_id": statistic_id(envelope, field),
+                "name": f"{envelope} {name}",
+                "unit_of_measurement": currency,
+                "has_mean": True,
+                "has_sum": False,
+            }
+            batches.append((metadata, rows))
+        imported[envelope] = latest
+    return batches, imported
@@ -8,12 +8,27 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_FILE_PATH, CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_EXCLUDE,
+    CONF_FILE_PATH,
+    CONF_INCLUDE,
+    CONF_NAME,
+    CONF_SCAN_INTERVAL,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
-
-from .const import DOMAIN
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    CONF_CURRENCY,
+    CONF_SENSORS,
+    CONF_UNRECORDED_PERCENTAGE,
+    DEFAULT_CURRENCY,
+    DOMAIN,
+    WATCH_SAFETY_INTERVAL,
+)
+from .sensor import SENSORS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -64,12 +79,25 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     return {"title": data[CONF_NAME], CONF_FILE_PATH: data[CONF_FILE_PATH]}
 
 
+def split_patterns(patterns: str) -> list[str]:
+    """Return the comma separated glob patterns of an options field."""
+    return [pattern.strip() for pattern in patterns.split(",") if pattern.strip()]
+
+
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for envelope-budget."""
 
     VERSION = 1
     MINOR_VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Return the options flow."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -95,6 +123,60 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Select the sensors of the envelopes and how the file is watched."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            # the frontend leaves cleared fields out
+            user_input[CONF_INCLUDE] = split_patterns(user_input.get(CONF_INCLUDE, ""))
+            user_input[CONF_EXCLUDE] = split_patterns(user_input.get(CONF_EXCLUDE, ""))
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        sensor_kinds = {sensor.key: sensor.key for sensor in SENSORS}
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_SENSORS, default=options.get(CONF_SENSORS, list(sensor_kinds))
+                ): cv.multi_select(sensor_kinds),
+                vol.Required(
+                    CONF_UNRECORDED_PERCENTAGE,
+                    default=options.get(CONF_UNRECORDED_PERCENTAGE, False),
+                ): bool,
+                vol.Required(
+                    CONF_CURRENCY, default=options.get(CONF_CURRENCY, DEFAULT_CURRENCY)
+                ): str,
+                vol.Required(
+                    CONF_SCAN_INTERVAL,
+                    default=options.get(CONF_SCAN_INTERVAL, WATCH_SAFETY_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                # suggested instead of default values, a default would be put
+                # back if the patterns are cleared
+                vol.Optional(
+                    CONF_INCLUDE,
+                    description={
+                        "suggested_value": ", ".join(options.get(CONF_INCLUDE, ()))
+                    },
+                ): str,
+                vol.Optional(
+                    CONF_EXCLUDE,
+                    description={
+                        "suggested_value": ", ".join(options.get(CONF_EXCLUDE, ()))
+                    },
+                ): str,
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
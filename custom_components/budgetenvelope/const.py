@@ -1,3 +1,41 @@
 """Constants for the budget-envelope integration."""
 
 DOMAIN = "budgetenvelope"
+
+# Seconds a refresh may spend reading and processing the states file before a
+# warning is logged.
+REFRESH_LATENCY_BUDGET = 0.5
+
+# Seconds without further write events before the states file is re-read.
+WATCH_DEBOUNCE = 0.5
+
+# Seconds between polls of the states file where inotify is not available.
+WATCH_POLL_INTERVAL = 5
+
+# Seconds between polls of the states file while inotify is watching it, for
+# network shares that do not report writes from other machines.
+WATCH_SAFETY_INTERVAL = 180
+
+# Persisted snapshot of the processed envelope states, one per config entry.
+STORAGE_KEY = f"{DOMAIN}.snapshot"
+STORAGE_VERSION = 1
+
+# Seconds to wait before writing the snapshot after a refresh.
+SNAPSHOT_SAVE_DELAY = 10
+
+# Options
+CONF_CURRENCY = "currency"
+CONF_SENSORS = "sensors"
+# show the state percentage as an unrecorded attribute of the balance sensor
+# instead of as a sensor of its own
+CONF_UNRECORDED_PERCENTAGE = "unrecorded_percentage"
+
+DEFAULT_CURRENCY = "CHF"
+
+# Seconds before the first retry after a failed refresh, doubled with every
+# further failure up to RETRY_MAX. A file that cannot be parsed is most likely
+# still being written and retried right away, a missing or unreadable file is
+# backed off further.
+RETRY_MID_WRITE = 0.05
+RETRY_UNAVAILABLE = 5
+RETRY_MAX = 300
@@ -0,0 +1,60 @@
+"""Derived fields of the envelope states, computed column by column.
+
+Amounts are converted once into integer cents, so the derived fields and
+rollups are exact instead of floats patched up with round().
+"""
+from __future__ import annotations
+
+from array import array
+
+# largest amount in cents accepted, far beyond any budget, so the int64 cents
+# columns also hold the rollups of thousands of envelopes
+MAX_CENTS = (2**63 - 1) // 10000
+
+
+def to_cents(value) -> int:
+    """Return an amount of the states file in cents, 0 if it is missing or NaN."""
+    if value is None or (value := float(value)) != value:
+        return 0
+    return round(value * 100)
+
+
+def from_cents(cents: int) -> float:
+    """Return the amount of cents, the float closest to the exact decimal."""
+    return cents / 100
+
+
+def money(value) -> float | None:
+    """Return an amount of the states file rounded to cents, None if missing or NaN."""
+    if value is None or value != value:
+        return None
+    return from_cents(to_cents(value))
+
+
+def _div_round(numerator: int, denominator: int) -> int:
+    """Return numerator / denominator rounded half to even, in integers."""
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def derive_columns(state: array, budget: array, carryover: array) -> list[int]:
+    """Return the state percentage in hundredths of a percent.
+
+    The columns are array('q') of cents of the same length, a missing
+    carryover is 0. The state percentage refers to budget plus carryover and
+    is 0 unless the state is positive and budget plus carryover is not 0,
+    e.g. for the rollup of sub-envelopes whose budgets cancel out. Only the
+    latest month of every envelope is derived, too few rows to vectorize.
+    """
+    percentage = []
+    for row_state, row_budget, row_carryover in zip(state, budget, carryover):
+        if row_state <= 0 or (divisor := row_budget + row_carryover) == 0:
+            percentage.append(0)
+            continue
+        percentage.append(_div_round(row_state * 10000, divisor))
+    return percentage
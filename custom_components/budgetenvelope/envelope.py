@@ -0,0 +1,42 @@
+"""Processed state of an envelope."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, fields
+import sys
+
+
+@dataclass(frozen=True, slots=True)
+class EnvelopeState:
+    """Latest month of an envelope with its derived fields.
+
+    Immutable, so the table of the coordinator can be shared with the entities
+    and the executor without copying.
+    """
+
+    envelope: str
+    month: str | None
+    state: float
+    budget: float
+    # 0 if the record has none
+    carryover: float
+    # the state in % of budget plus carryover
+    state_percentage: float
+    adjustment: float | None = None
+    state_month: float | None = None
+    # True if the values are the sum of the sub-envelopes
+    rollup: bool = False
+
+    @classmethod
+    def from_record(cls, record: Mapping) -> EnvelopeState:
+        """Return the state of a stored record, ignoring unknown fields."""
+        values = {name: record[name] for name in _FIELDS if name in record}
+        values["envelope"] = sys.intern(values["envelope"])
+        return cls(**values)
+
+    def as_dict(self) -> dict:
+        """Return the fields as a dict, e.g. for storage."""
+        return asdict(self)
+
+
+_FIELDS = tuple(field.name for field in fields(EnvelopeState))
@@ -0,0 +1,136 @@
+"""Hierarchy of the envelopes encoded in their ":" separated names."""
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+
+from .derived import from_cents, to_cents
+
+# the envelope of the "" records, the root of the hierarchy
+ROOT = "All"
+
+SEPARATOR = ":"
+
+# numeric fields of the latest records that are summed up to the parents
+ROLLUP_FIELDS = ("state", "budget", "carryover", "adjustment")
+
+
+def parent_of(envelope: str) -> str | None:
+    """Return the parent of an envelope name, None for the root."""
+    if envelope == ROOT:
+        return None
+    parent, separator, _ = envelope.rpartition(SEPARATOR)
+    return parent if separator else ROOT
+
+
+class EnvelopeNode:
+    """An envelope in the hierarchy with the rollup of its subtree."""
+
+    __slots__ = (
+        "name",
+        "label",
+        "parent",
+        "children",
+        "depth",
+        "emitted",
+        "month",
+        "rollup",
+    )
+
+    def __init__(self, name: str, parent: EnvelopeNode | None) -> None:
+        """Initialize a node below parent."""
+        self.name = name
+        # the name without the parent envelopes, for display
+        self.label = name.rpartition(SEPARATOR)[2]
+        self.parent = parent
+        self.children: list[EnvelopeNode] = []
+        self.depth = 0 if parent is None else parent.depth + 1
+        # False for parents only known from the names of their children
+        self.emitted = False
+        # latest "YYYY-MM" month of the subtree
+        self.month: str | None = None
+        # in cents, so the sums are exact
+        self.rollup = dict.fromkeys(ROLLUP_FIELDS, 0)
+        if parent is not None:
+            parent.children.append(self)
+
+
+class EnvelopeTree:
+    """Tree index of the envelopes with bottom-up rollups.
+
+    Built from the latest record of every envelope. The rollup of an envelope
+    without children is its own values, the rollup of a parent is the sum of
+    the rollups of its children. Rollups are in cents, missing values count
+    as 0. Parents without a record of their own, or with a record that is
+    itself a rollup, are not emitted.
+    """
+
+    def __init__(self, records: Mapping[str, Mapping]) -> None:
+        """Index the latest records, keyed by envelope."""
+        self._nodes: dict[str, EnvelopeNode] = {}
+        for envelope, record in records.items():
+            self._add(envelope).emitted = not record.get("rollup", False)
+
+        # parents first, so walking the order backwards visits every child
+        # before its parent and sums up all subtrees in one pass
+        self._order = sorted(self._nodes.values(), key=lambda node: node.depth)
+        for node in reversed(self._order):
+            if not node.children:
+                record = records[node.name]
+                node.month = record.get("month")
+                for field in ROLLUP_FIELDS:
+                    node.rollup[field] = to_cents(record.get(field))
+            if (parent := node.parent) is None:
+                continue
+            for field, value in node.rollup.items():
+                parent.rollup[field] += value
+            if node.month is not None and (
+                parent.month is None or node.month > parent.month
+            ):
+                parent.month = node.month
+
+    def _add(self, envelope: str) -> EnvelopeNode:
+        """Add an envelope and any missing parents, return its node."""
+        if (node := self._nodes.get(envelope)) is None:
+            parent = parent_of(envelope)
+            node = self._nodes[envelope] = EnvelopeNode(
+                envelope, None if parent is None else self._add(parent)
+            )
+        return node
+
+    def __contains__(self, envelope: str) -> bool:
+        """Return True if the envelope is in the hierarchy."""
+        return envelope in self._nodes
+
+    def __getitem__(self, envelope: str) -> EnvelopeNode:
+        """Return the node of an envelope."""
+        return self._nodes[envelope]
+
+    def __iter__(self) -> Iterator[EnvelopeNode]:
+        """Iterate over the nodes, parents before their children."""
+        return iter(self._order)
+
+    def __len__(self) -> int:
+        """Return the number of envelopes, including the parents added."""
+        return len(self._nodes)
+
+    def label(self, envelope: str) -> str:
+        """Return the display name of an envelope."""
+        if (node := self._nodes.get(envelope)) is None:
+            return envelope.rpartition(SEPARATOR)[2]
+        return node.label
+
+    def rollup_records(self) -> dict[str, dict]:
+        """Return states records made of the rollups of the parents not emitted."""
+        records = {}
+        for node in self._order:
+            if node.emitted:
+                continue
+            record = {
+                field: from_cents(cents) for field, cents in node.rollup.items()
+            }
+            record["envelope"] = node.name
+            if node.month is not None:
+                record["month"] = node.month
+            record["rollup"] = True
+            records[node.name] = record
+        return records
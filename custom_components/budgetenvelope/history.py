@@ -0,0 +1,140 @@
+"""Compact in-memory history of the envelope states."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+import math
+
+# numeric fields of a states record kept for every month
+HISTORY_FIELDS = ("budget", "state_month", "state", "carryover", "adjustment")
+
+
+def month_index(month: str) -> int:
+    """Return the index of a "YYYY-MM" month, counted from January of year 0."""
+    year, _, month_of_year = month.partition("-")
+    return int(year) * 12 + int(month_of_year) - 1
+
+
+def month_label(index: int) -> str:
+    """Return the "YYYY-MM" month of a month index."""
+    year, month_of_year = divmod(index, 12)
+    return f"{year:04d}-{month_of_year + 1:02d}"
+
+
+def _as_float(value) -> float:
+    """Return a record value as float, NaN if it is missing."""
+    if value is None:
+        return math.nan
+    return float(value)
+
+
+class EnvelopeHistory:
+    """Monthly values of one envelope as columns ordered by month.
+
+    Every field is an array('d') with NaN for missing values and the months
+    are an array('l') of month indexes, so a row costs a few dozen bytes
+    instead of a dict per record.
+    """
+
+    __slots__ = ("months", "columns", "_sorted")
+
+    def __init__(self) -> None:
+        """Initialize an empty history."""
+        self.months = array("l")
+        self.columns = {field: array("d") for field in HISTORY_FIELDS}
+        self._sorted = True
+
+    def __len__(self) -> int:
+        """Return the number of months."""
+        return len(self.months)
+
+    def append(self, month: int, record) -> None:
+        """Add the values of a record for a month index."""
+        if self.months and month <= self.months[-1]:
+            self._sorted = False
+        self.months.append(month)
+        for field, column in self.columns.items():
+            column.append(_as_float(record.get(field)))
+
+    def finish(self) -> None:
+        """Order the rows by month, keeping the last record of a duplicate month."""
+        if self._sorted:
+            return
+
+        # stable sort, so the last of several records for a month comes last
+        order = sorted(range(len(self.months)), key=self.months.__getitem__)
+        keep = [
+            row
+            for position, row in enumerate(order)
+            if position + 1 == len(order)
+            or self.months[order[position + 1]] != self.months[row]
+        ]
+        self.months = array("l", (self.months[row] for row in keep))
+        for field, column in self.columns.items():
+            self.columns[field] = array("d", (column[row] for row in keep))
+        self._sorted = True
+
+    def row(self, month: int) -> int | None:
+        """Return the row of a month index, None if there is none."""
+        row = bisect_left(self.months, month)
+        if row < len(self.months) and self.months[row] == month:
+            return row
+        return None
+
+
+class HistoryStore:
+    """History of all envelopes, queryable by envelope and month."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._envelopes: dict[str, EnvelopeHistory] = {}
+
+    def __len__(self) -> int:
+        """Return the number of stored envelope months."""
+        return sum(len(history) for history in self._envelopes.values())
+
+    def __contains__(self, envelope: str) -> bool:
+        """Return True if there is history for an envelope."""
+        return envelope in self._envelopes
+
+    def add(self, envelope: str, month: int, record) -> None:
+        """Add a states record of an envelope for a month index."""
+        if (history := self._envelopes.get(envelope)) is None:
+            history = self._envelopes[envelope] = EnvelopeHistory()
+        history.append(month, record)
+
+    def finish(self) -> None:
+        """Order all histories, call once all records were added."""
+        for history in self._envelopes.values():
+            history.finish()
+
+    def envelopes(self) -> list[str]:
+        """Return the envelopes with history."""
+        return list(self._envelopes)
+
+    def months(self, envelope: str) -> list[str]:
+        """Return the months with values for an envelope, oldest first."""
+        if (history := self._envelopes.get(envelope)) is None:
+            return []
+        return [month_label(month) for month in history.months]
+
+    def get(self, envelope: str, month: str) -> dict[str, float | None] | None:
+        """Return the values of an envelope for a month, None if there are none."""
+        if (history := self._envelopes.get(envelope)) is None:
+            return None
+        if (row := history.row(month_index(month))) is None:
+            return None
+        return {
+            field: None if math.isnan(value := column[row]) else value
+            for field, column in history.columns.items()
+        }
+
+    def series(self, envelope: str, field: str) -> list[tuple[str, float]]:
+        """Return the (month, value) pairs of a field, skipping missing values."""
+        if (history := self._envelopes.get(envelope)) is None:
+            return []
+        return [
+            (month_label(month), value)
+            for month, value in zip(history.months, history.columns[field])
+            if not math.isnan(value)
+        ]
@@ -1,8 +1,10 @@
 """Sensor integration."""
 from __future__ import annotations
 
-from collections.abc import Callable
-from dataclasses import dataclass
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, replace
+from fnmatch import fnmatchcase
+import time
 from typing import cast
 
 from homeassistant.components.sensor import (
@@ -11,12 +13,38 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import PERCENTAGE
+from homeassistant.const import (
+    CONF_EXCLUDE,
+    CONF_INCLUDE,
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.update_coordinator import (
+    CoordinatorEntity,
+    DataUpdateCoordinator,
+)
+
+from . import DIAGNOSTICS, BudgetEnvelopeBaseEntity
+from .const import (
+    CONF_CURRENCY,
+    CONF_SENSORS,
+    CONF_UNRECORDED_PERCENTAGE,
+    DEFAULT_CURRENCY,
+    DOMAIN,
+)
 
-from . import BudgetEnvelopeBaseEntity, get_object_value
-from .const import DOMAIN
+# attribute of the balance sensor with the state percentage, see
+# CONF_UNRECORDED_PERCENTAGE
+ATTR_STATE_PERCENTAGE = "state_percentage"
+# when the data became stale, set while the file cannot be read or parsed
+ATTR_STALE_SINCE = "stale_since"
 
 
 @dataclass
@@ -24,6 +52,8 @@ class BudgetEnvelopeEntityDescription(SensorEntityDescription):
     """Describes Budget Envelope sensor entity."""
 
     value: Callable = lambda x, y: x
+    # key of a value shown as the ATTR_STATE_PERCENTAGE attribute
+    percentage_key: str | None = None
 
 
 SENSORS: tuple[BudgetEnvelopeEntityDescription, ...] = [
@@ -33,9 +63,12 @@ SENSORS: tuple[BudgetEnvelopeEntityDescription, ...] = [
             name="", # keep main sensor name short in display
             icon="mdi:email-open",
             #icon="mdi:chart-waterfall",
-            value=lambda data: data["state"],
+            value=lambda state: state.state,
             suggested_display_precision=0,
             device_class=SensorDeviceClass.MONETARY,
+            # monetary sensors only support totals, the statistics keep
+            # the balance over time
+            state_class=SensorStateClass.TOTAL,
             native_unit_of_measurement="CHF",
         )
     ),
@@ -44,9 +77,10 @@ SENSORS: tuple[BudgetEnvelopeEntityDescription, ...] = [
             key="Balance Percent",
             name="%", # keep main sensor name short in display
             icon="mdi:percent-box",
-            value=lambda data: data["state_percentage"],
+            value=lambda state: state.state_percentage,
             suggested_display_precision=0,
             device_class=SensorDeviceClass.BATTERY,
+            state_class=SensorStateClass.MEASUREMENT,
             native_unit_of_measurement=PERCENTAGE,
         )
     ),
@@ -55,9 +89,10 @@ SENSORS: tuple[BudgetEnvelopeEntityDescription, ...] = [
             key="Budget",
             name="Budget",
             icon="mdi:email",
-            value=lambda data: data["budget"],
+            value=lambda state: state.budget,
             suggested_display_precision=0,
             device_class=SensorDeviceClass.MONETARY,
+            state_class=SensorStateClass.TOTAL,
             native_unit_of_measurement="CHF",
         )
     ),
@@ -66,9 +101,10 @@ SENSORS: tuple[BudgetEnvelopeEntityDescription, ...] = [
             key="Adjustment",
             name="Adjustment",
             icon="mdi:cash-edit",
-            value=lambda data: data["adjustment"],
+            value=lambda state: state.adjustment,
             suggested_display_precision=0,
             device_class=SensorDeviceClass.MONETARY,
+            state_class=SensorStateClass.TOTAL,
             native_unit_of_measurement="CHF",
         )
     ),    
@@ -77,38 +113,237 @@ SENSORS: tuple[BudgetEnvelopeEntityDescription, ...] = [
             key="Carryover",
             name="Carryover",
             icon="mdi:transfer-right",
-            value=lambda data: data["carryover"],
+            value=lambda state: state.carryover,
             suggested_display_precision=0,
             device_class=SensorDeviceClass.MONETARY,
+            state_class=SensorStateClass.TOTAL,
             native_unit_of_measurement="CHF",
         )
     ),
 ]
 
+BALANCE_SENSOR, PERCENTAGE_SENSOR = SENSORS[0], SENSORS[1]
+
+
+# Health of the coordinator, the value is read from the coordinator. They are
+# disabled by default, enable them to graph the refresh performance.
+DIAGNOSTIC_SENSORS: tuple[BudgetEnvelopeEntityDescription, ...] = (
+    BudgetEnvelopeEntityDescription(
+        key="parse_duration",
+        name="Parse duration",
+        icon="mdi:timer-outline",
+        value=lambda coordinator: coordinator.timings.get("parse", 0) * 1000,
+        suggested_display_precision=1,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+    ),
+    BudgetEnvelopeEntityDescription(
+        key="process_duration",
+        name="Processing duration",
+        icon="mdi:timer-cog-outline",
+        value=lambda coordinator: coordinator.timings.get("process", 0) * 1000,
+        suggested_display_precision=1,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+    ),
+    BudgetEnvelopeEntityDescription(
+        key="bytes_read",
+        name="Bytes read",
+        icon="mdi:file-download-outline",
+        value=lambda coordinator: coordinator.bytes_read,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+    ),
+    BudgetEnvelopeEntityDescription(
+        key="records",
+        name="Records",
+        icon="mdi:file-table-outline",
+        value=lambda coordinator: coordinator.records,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    BudgetEnvelopeEntityDescription(
+        key="quarantined_records",
+        name="Invalid records",
+        icon="mdi:file-alert-outline",
+        value=lambda coordinator: coordinator.quarantine.count,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    BudgetEnvelopeEntityDescription(
+        key="stale_since",
+        name="Stale since",
+        icon="mdi:file-clock-outline",
+        value=lambda coordinator: coordinator.stale_since,
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
+    BudgetEnvelopeEntityDescription(
+        key="envelopes",
+        name="Envelopes",
+        icon="mdi:email-multiple-outline",
+        value=lambda coordinator: len(coordinator.data),
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    BudgetEnvelopeEntityDescription(
+        key="skipped_refreshes",
+        name="Skipped refreshes",
+        icon="mdi:file-check-outline",
+        value=lambda coordinator: coordinator.skipped_refreshes,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    BudgetEnvelopeEntityDescription(
+        key="suppressed_writes",
+        name="Suppressed state writes",
+        icon="mdi:content-save-off-outline",
+        value=lambda coordinator: coordinator.suppressed_writes,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+)
+
+
+def selected_sensors(
+    options: Mapping,
+) -> tuple[BudgetEnvelopeEntityDescription, ...]:
+    """Return the descriptions of the sensor kinds selected in the options."""
+    keys = options.get(CONF_SENSORS)
+    currency = options.get(CONF_CURRENCY, DEFAULT_CURRENCY)
+    sensors = []
+    for sensor in SENSORS:
+        if keys is not None and sensor.key not in keys:
+            continue
+        if sensor.device_class == SensorDeviceClass.MONETARY:
+            sensor = replace(sensor, native_unit_of_measurement=currency)
+        if options.get(CONF_UNRECORDED_PERCENTAGE):
+            # the percentage changes with every balance change, keep it out of
+            # the recorder as an unrecorded attribute of the balance
+            if sensor.key == PERCENTAGE_SENSOR.key:
+                continue
+            if sensor.key == BALANCE_SENSOR.key:
+                sensor = replace(sensor, percentage_key=PERCENTAGE_SENSOR.key)
+        sensors.append(sensor)
+    return tuple(sensors)
+
+
+def envelope_filter(options: Mapping) -> Callable[[str], bool]:
+    """Return whether an envelope matches the include and exclude patterns.
+
+    The patterns are globs on the ":" separated envelope names, an envelope
+    is selected if it matches any include pattern, or there are none, and no
+    exclude pattern.
+    """
+    include = options.get(CONF_INCLUDE) or ()
+    exclude = options.get(CONF_EXCLUDE) or ()
+
+    def selected(envelope: str) -> bool:
+        return (
+            not include or any(fnmatchcase(envelope, pattern) for pattern in include)
+        ) and not any(fnmatchcase(envelope, pattern) for pattern in exclude)
+
+    return selected
+
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Add sensors for passed config_entry in HA."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id + "_coordinator"]
 
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_config_entry_first_refresh()
+    # The coordinator already holds the data of the first refresh or the
+    # persisted snapshot, see async_setup_entry in __init__.py
+    start = time.monotonic()
+
+    # the options filter the sensors before any entity is created
+    sensors = selected_sensors(config_entry.options)
+    selected = envelope_filter(config_entry.options)
+
+    coordinator.async_update_devices(selected)
+    coordinator.async_set_value_descriptions(
+        (*sensors, PERCENTAGE_SENSOR)
+        if any(sensor.percentage_key for sensor in sensors)
+        else sensors
+    )
+
+    # sensors of every envelope, to remove them with their envelope
+    envelope_entities: dict[str, list[BudgetEnvelopeSensor]] = {}
+
+    def envelope_sensors(envelopes) -> list[SensorEntity]:
+        """Return the sensors of envelopes."""
+        entities: list[SensorEntity] = []
+        for key in envelopes:
+            if not selected(key):
+                continue
+            envelope_entities[key] = [
+                BudgetEnvelopeSensor(sensor, coordinator, key) for sensor in sensors
+            ]
+            entities.extend(envelope_entities[key])
+        return entities
+
+    @callback
+    def async_add_remove_envelopes() -> None:
+        """Add and remove the sensors of the envelopes added and removed.
+
+        The registry entries and devices of removed envelopes are kept, an
+        envelope may only be missing for a while, e.g. if all its records
+        are invalid. async_remove_stale_entries removes them with the next
+        setup.
+        """
+        if removed := coordinator.removed_envelopes & envelope_entities.keys():
+            for key in removed:
+                for entity in envelope_entities.pop(key):
+                    hass.async_create_task(entity.async_remove())
+
+        if added := coordinator.added_envelopes - envelope_entities.keys():
+            coordinator.async_update_devices(selected)
+            if added_sensors := envelope_sensors(added):
+                async_add_entities(added_sensors)
 
-    entities: list[BudgetEnvelopeSensor] = []
+    config_entry.async_on_unload(
+        coordinator.async_add_listener(async_add_remove_envelopes)
+    )
 
-    # for index, vehicle in enumerate(coordinator.data):
-    for key in coordinator.data:
-        for sensor in SENSORS:
-            entities.append(BudgetEnvelopeSensor(sensor, coordinator, key))
+    entities = envelope_sensors(coordinator.data)
+    entities.extend(
+        BudgetEnvelopeDiagnosticSensor(sensor, coordinator, config_entry)
+        for sensor in DIAGNOSTIC_SENSORS
+    )
+
+    async_remove_stale_entries(hass, config_entry, entities, coordinator.devices)
+
+    coordinator.startup_timings["sensor entities"] = time.monotonic() - start
 
     if entities:
         async_add_entities(entities)
 
 
+@callback
+def async_remove_stale_entries(hass, config_entry, entities, devices) -> None:
+    """Remove the sensors and devices of envelopes and kinds not selected."""
+    entity_registry = er.async_get(hass)
+    unique_ids = {entity.unique_id for entity in entities}
+    for entry in er.async_entries_for_config_entry(
+        entity_registry, config_entry.entry_id
+    ):
+        if entry.domain == "sensor" and entry.unique_id not in unique_ids:
+            entity_registry.async_remove(entry.entity_id)
+
+    device_registry = dr.async_get(hass)
+    identifiers = {(DOMAIN, envelope) for envelope in devices}
+    identifiers.add((DOMAIN, config_entry.entry_id))
+    for device in dr.async_entries_for_config_entry(
+        device_registry, config_entry.entry_id
+    ):
+        if not device.identifiers & identifiers:
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=config_entry.entry_id
+            )
+
+
 class BudgetEnvelopeSensor(BudgetEnvelopeBaseEntity, SensorEntity):
     """Representation of a VolkswagenID vehicle sensor."""
 
     entity_description: BudgetEnvelopeEntityDescription
 
+    _unrecorded_attributes = frozenset({ATTR_STATE_PERCENTAGE, ATTR_STALE_SINCE})
+
     def __init__(
         self,
         sensor: BudgetEnvelopeEntityDescription,
@@ -121,23 +356,93 @@ class BudgetEnvelopeSensor(BudgetEnvelopeBaseEntity, SensorEntity):
         #sensor configuration
         self.entity_description = sensor
         self._coordinator = coordinator
-        self._attr_unique_id = f"envbudget-{self.data['envelope']}-{sensor.key}"
-        self.entity_id = f"sensor.{self.data['envelope']}-{sensor.key}"
+        self._attr_unique_id = f"envbudget-{self.data.envelope}-{sensor.key}"
+        # key of the value in the table precomputed by the coordinator
+        self._value_key = (index, sensor.key)
+        self._percentage_key = sensor.percentage_key and (index, sensor.percentage_key)
+        self.entity_id = f"sensor.{self.data.envelope}-{sensor.key}"
         if sensor.native_unit_of_measurement:
             self._attr_native_unit_of_measurement = sensor.native_unit_of_measurement
 
-        # display only the shortest needed name
-        # remove the parent envelopes
-        subenvelope_name = self.data['envelope'].split(':')[-1]
+        # display only the shortest needed name, without the parent envelopes
+        subenvelope_name = coordinator.tree.label(self.data.envelope)
         self._attr_name = f"{subenvelope_name} {sensor.name}"
 
+        # what was written to the state machine last
+        self._last_written = None
+
+    def _written_state(self) -> tuple:
+        """Return the parts of the state that are written to the state machine."""
+        return (self.available, self.native_value, self.extra_state_attributes)
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the initial state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._last_written = self._written_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the value or attributes changed."""
+        written = self._written_state()
+        if written == self._last_written:
+            self._coordinator.suppressed_writes += 1
+            return
+
+        self._last_written = written
+        self.async_write_ha_state()
+
     @property
     def native_value(self) -> StateType:
         """Return the state."""
+        return self._coordinator.values.get(self._value_key)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, StateType] | None:
+        """Return the state percentage if it has no sensor of its own.
+
+        Adds since when the value is stale if the last refreshes failed.
+        """
+        attributes = {}
+        if self._percentage_key is not None:
+            attributes[ATTR_STATE_PERCENTAGE] = self._coordinator.values.get(
+                self._percentage_key
+            )
+        if (stale_since := self._coordinator.stale_since) is not None:
+            attributes[ATTR_STALE_SINCE] = stale_since.isoformat()
+        return attributes or None
 
-        try:
-            state = get_object_value(self.entity_description.value(self.data))
-        except (KeyError, ValueError):
-            return None
 
-        return cast(StateType, state)
\ No newline at end of file
+class BudgetEnvelopeDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor of the envelope coordinator."""
+
+    entity_description: BudgetEnvelopeEntityDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        sensor: BudgetEnvelopeEntityDescription,
+        coordinator: DataUpdateCoordinator,
+        config_entry,
+    ) -> None:
+        """Initialize the diagnostic sensor."""
+        super().__init__(coordinator, context=DIAGNOSTICS)
+        self.entity_description = sensor
+        self._attr_unique_id = f"envbudget-{config_entry.entry_id}-{sensor.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name=config_entry.title,
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @property
+    def available(self) -> bool:
+        """Report the diagnostics even if the last refresh failed."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state."""
+        return cast(StateType, self.entity_description.value(self.coordinator))
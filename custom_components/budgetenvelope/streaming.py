@@ -0,0 +1,139 @@
+"""Incremental parsing of the envelope states file."""
+from __future__ import annotations
+
+import codecs
+from collections.abc import Iterator
+import json
+import re
+import time
+from typing import BinaryIO, Protocol
+
+# bytes read from the file at a time
+CHUNK_SIZE = 64 * 1024
+
+# characters a single item may span, larger items are taken for invalid JSON
+# instead of buffering the rest of the file
+MAX_ITEM_SIZE = 1024 * 1024
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# characters that may continue a number decoded at the end of the buffer
+NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+
+
+class Digest(Protocol):
+    """A hashlib object."""
+
+    def update(self, data: bytes, /) -> None:
+        """Hash data."""
+
+
+class JsonArrayReader:
+    """Iterate over the items of a top-level JSON array in a binary file.
+
+    Only the current chunk of the file and the item being decoded are held in
+    memory, the items are decoded one at a time with the C scanner of the json
+    module as they are consumed. Keeps count of the bytes read, the items and
+    the seconds spent reading and decoding. A digest is updated with the
+    chunks as they are read, so the file is hashed in the same pass.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        chunk_size: int = CHUNK_SIZE,
+        digest: Digest | None = None,
+    ) -> None:
+        """Initialize the reader."""
+        self.file = file
+        self.chunk_size = chunk_size
+        self.digest = digest
+        self.bytes_read = 0
+        self.items = 0
+        self.parse_time = 0.0
+
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, return False at the end of file."""
+        if self._eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        self.bytes_read += len(chunk)
+        if self.digest is not None:
+            self.digest.update(chunk)
+        self._eof = not chunk
+        # drop what was consumed already
+        self._buffer = self._buffer[self._position :] + self._text.decode(
+            chunk, final=self._eof
+        )
+        self._position = 0
+        return not self._eof
+
+    def _next_token(self) -> str:
+        """Skip whitespace and return the next character, "" at the end of file."""
+        while True:
+            self._position = WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return ""
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        """Return a decode error at the current position."""
+        return json.JSONDecodeError(message, self._buffer, self._position)
+
+    def __iter__(self) -> Iterator:
+        """Yield the items of the array."""
+        start = time.perf_counter()
+        if self._next_token() != "[":
+            raise self._error("Expecting '['")
+        self._position += 1
+
+        if self._next_token() == "]":
+            self._position += 1
+        else:
+            while True:
+                self._next_token()
+                item = self._decode_item()
+                self.items += 1
+                self.parse_time += time.perf_counter() - start
+                yield item
+                start = time.perf_counter()
+
+                token = self._next_token()
+                self._position += 1
+                if token == "]":
+                    break
+                if token != ",":
+                    raise self._error("Expecting ',' delimiter")
+
+        if self._next_token() != "":
+            raise self._error("Extra data")
+        self.parse_time += time.perf_counter() - start
+
+    def _decode_item(self):
+        """Decode the item at the current position, reading more as needed."""
+        while True:
+            try:
+                item, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                # the item continues in the next chunk, or the file is truncated
+                if len(self._buffer) - self._position > MAX_ITEM_SIZE:
+                    raise
+                if not self._fill():
+                    raise
+                continue
+            # a number at the end of the buffer might continue in the next chunk
+            if (
+                isinstance(item, (int, float))
+                and NUMBER_TAIL.match(self._buffer, end)
+                and self._fill()
+            ):
+                continue
+            self._position = end
+            return item
@@ -0,0 +1,103 @@
+"""Validation of the records of the states file."""
+from __future__ import annotations
+
+import math
+import re
+from typing import NamedTuple
+
+from .derived import MAX_CENTS, to_cents
+
+# reports kept per refresh, the rest is only counted
+MAX_REPORTS = 20
+
+MONTH = re.compile(r"\d{4}-(0[1-9]|1[0-2])")
+
+# (field, required) of the numeric fields of a record, the producer writes NaN
+# for missing optional fields
+NUMBER_FIELDS = (
+    ("state", True),
+    ("budget", True),
+    ("carryover", False),
+    ("adjustment", False),
+    ("state_month", False),
+)
+
+
+class RecordError(NamedTuple):
+    """Why a record of the states file was rejected."""
+
+    index: int
+    envelope: str | None
+    field: str | None
+    reason: str
+
+    def __str__(self) -> str:
+        """Return a one line description for the log."""
+        where = f"record {self.index}"
+        if self.envelope is not None:
+            where += f" ({self.envelope!r})"
+        if self.field is not None:
+            where += f" {self.field}"
+        return f"{where}: {self.reason}"
+
+
+class Quarantine:
+    """Records rejected during a refresh."""
+
+    __slots__ = ("count", "reports")
+
+    def __init__(self) -> None:
+        """Initialize an empty quarantine."""
+        self.count = 0
+        self.reports: list[RecordError] = []
+
+    def __len__(self) -> int:
+        """Return the number of rejected records."""
+        return self.count
+
+    def add(self, error: RecordError) -> None:
+        """Count a rejected record, keeping the first MAX_REPORTS reports."""
+        self.count += 1
+        if len(self.reports) < MAX_REPORTS:
+            self.reports.append(error)
+
+
+def _check_number(value, allow_nan: bool) -> str | None:
+    """Return why a value is not a valid amount, None if it is."""
+    # bool is an int, but never an amount
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return f"expected a number, got {type(value).__name__}"
+    if math.isinf(value) or (not allow_nan and math.isnan(value)):
+        return f"expected a finite number, got {value}"
+    if abs(to_cents(value)) > MAX_CENTS:
+        return f"expected at most {MAX_CENTS // 100} in absolute value, got {value}"
+    return None
+
+
+def validate_record(raw) -> tuple[str | None, str] | None:
+    """Return the (field, reason) why a record is invalid, None if it is valid.
+
+    Checks the record in a single pass over the fields it needs. A budget
+    plus carryover of 0 is valid, the state percentage is then 0 as for the
+    rollups.
+    """
+    if not isinstance(raw, dict):
+        return None, f"expected an object, got {type(raw).__name__}"
+
+    if "envelope" not in raw:
+        return "envelope", "missing"
+    if (envelope := raw["envelope"]) is not None and not isinstance(envelope, str):
+        return "envelope", f"expected a string, got {type(envelope).__name__}"
+    if "month" in raw and not (
+        isinstance(month := raw["month"], str) and MONTH.fullmatch(month)
+    ):
+        return "month", f'expected "YYYY-MM", got {month!r}'
+
+    for field, required in NUMBER_FIELDS:
+        if (value := raw.get(field)) is None:
+            if required:
+                return field, "missing"
+            continue
+        if (reason := _check_number(value, not required)) is not None:
+            return field, reason
+    return None
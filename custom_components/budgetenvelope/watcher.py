@@ -0,0 +1,232 @@
+"""Watch the envelope states file for changes."""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+import ctypes
+from datetime import timedelta
+import logging
+import os
+import struct
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .const import WATCH_DEBOUNCE, WATCH_POLL_INTERVAL, WATCH_SAFETY_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+# see inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+# struct inotify_event: wd, mask, cookie, len, followed by the name
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def _load_inotify():
+    """Return libc if it provides inotify, None otherwise."""
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1") or not hasattr(libc, "inotify_add_watch"):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+def file_signature(file_path):
+    """Return the (mtime_ns, size, inode) signature of a file, None if missing."""
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class EnvelopeFileWatcher:
+    """Call an action once the producer finished writing the states file.
+
+    Uses inotify on the parent directory, so that both in-place writes
+    (IN_CLOSE_WRITE) and atomic replacements (IN_MOVED_TO) are seen. Network
+    shares accept the watch but do not report writes from other machines, so
+    the file is also polled with os.stat every safety_interval seconds. Where
+    inotify is not available the file is polled every poll_interval seconds
+    instead and only acted on once its signature is stable for a poll. Bursts
+    of events are coalesced into one call after a quiet period of
+    WATCH_DEBOUNCE seconds.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        file_path: str,
+        action: Callable[[], Awaitable[None]],
+        debounce: float = WATCH_DEBOUNCE,
+        poll_interval: float = WATCH_POLL_INTERVAL,
+        safety_interval: float = WATCH_SAFETY_INTERVAL,
+    ) -> None:
+        """Initialize the watcher."""
+        self.hass = hass
+        self.file_path = os.path.abspath(file_path)
+        self.action = action
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.safety_interval = safety_interval
+
+        self._file_name = os.fsencode(os.path.basename(self.file_path))
+        self._fd: int | None = None
+        self._unsub_debounce: CALLBACK_TYPE | None = None
+        self._unsub_poll: CALLBACK_TYPE | None = None
+        self._signature = None
+        self._changed = False
+
+    @property
+    def push(self) -> bool:
+        """Return True if changes are pushed by inotify."""
+        return self._fd is not None
+
+    async def async_start(self) -> None:
+        """Start watching, falling back to polling if inotify is unavailable."""
+        if self._async_start_inotify():
+            await self._async_start_polling(self.safety_interval)
+        else:
+            await self._async_start_polling(self.poll_interval)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop watching."""
+        self._async_stop_inotify()
+        self._async_stop_polling()
+        if self._unsub_debounce is not None:
+            self._unsub_debounce()
+            self._unsub_debounce = None
+
+    @callback
+    def _async_start_inotify(self) -> bool:
+        """Watch the parent directory of the file with inotify."""
+        if (libc := _load_inotify()) is None:
+            _LOGGER.debug("inotify is not available, polling %s", self.file_path)
+            return False
+
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            _LOGGER.debug(
+                "inotify_init1 failed (%s), polling %s",
+                os.strerror(ctypes.get_errno()),
+                self.file_path,
+            )
+            return False
+
+        directory = os.fsencode(os.path.dirname(self.file_path))
+        if libc.inotify_add_watch(fd, directory, IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            _LOGGER.debug(
+                "Cannot watch %s (%s), polling %s",
+                os.fsdecode(directory),
+                os.strerror(ctypes.get_errno()),
+                self.file_path,
+            )
+            os.close(fd)
+            return False
+
+        self._fd = fd
+        self.hass.loop.add_reader(fd, self._async_handle_inotify)
+        _LOGGER.debug("Watching %s with inotify", self.file_path)
+        return True
+
+    @callback
+    def _async_stop_inotify(self) -> None:
+        """Close the inotify instance."""
+        if self._fd is None:
+            return
+        self.hass.loop.remove_reader(self._fd)
+        os.close(self._fd)
+        self._fd = None
+
+    @callback
+    def _async_handle_inotify(self) -> None:
+        """Drain the inotify queue and debounce events for the file."""
+        changed = False
+        lost_watch = False
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                _wd, mask, _cookie, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+                offset += INOTIFY_EVENT.size
+                name = buffer[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW or name == self._file_name:
+                    changed = True
+                if mask & IN_IGNORED:
+                    lost_watch = True
+
+        if lost_watch:
+            # the directory was removed or unmounted, the watch is gone
+            _LOGGER.debug("Lost inotify watch, polling %s", self.file_path)
+            self._async_stop_inotify()
+            self.hass.async_create_task(self._async_start_polling(self.poll_interval))
+            changed = True
+
+        if changed:
+            self._async_schedule_action()
+
+    async def _async_start_polling(self, interval: float) -> None:
+        """Poll the file signature every interval seconds."""
+        self._async_stop_polling()
+        self._signature = await self.hass.async_add_executor_job(
+            file_signature, self.file_path
+        )
+        self._unsub_poll = async_track_time_interval(
+            self.hass,
+            self._async_poll,
+            timedelta(seconds=interval),
+            name=f"Budget envelope file poll {self.file_path}",
+        )
+
+    @callback
+    def _async_stop_polling(self) -> None:
+        """Stop polling the file signature."""
+        if self._unsub_poll is not None:
+            self._unsub_poll()
+            self._unsub_poll = None
+
+    async def _async_poll(self, _now) -> None:
+        """Check whether the file signature changed since the last poll."""
+        signature = await self.hass.async_add_executor_job(
+            file_signature, self.file_path
+        )
+        if signature != self._signature:
+            self._signature = signature
+            if self.push:
+                # missed by inotify, acted on right away as the safety poll
+                # is slow; a file still being written is retried anyway
+                self._async_schedule_action()
+                return
+            # wait for the file to stop changing before acting on it
+            self._changed = True
+        elif self._changed:
+            self._changed = False
+            self._async_schedule_action()
+
+    @callback
+    def _async_schedule_action(self) -> None:
+        """(Re)start the debounce window."""
+        if self._unsub_debounce is not None:
+            self._unsub_debounce()
+        self._unsub_debounce = async_call_later(
+            self.hass, self.debounce, self._async_fire
+        )
+
+    @callback
+    def _async_fire(self, _now) -> None:
+        """Run the action after the debounce window passed quietly."""
+        self._unsub_debounce = None
+        self.hass.async_create_task(self.action())
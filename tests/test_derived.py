@@ -0,0 +1,98 @@
+"""Property tests of the integer cents arithmetic against exact fractions."""
+from __future__ import annotations
+
+from array import array
+from fractions import Fraction
+
+from hypothesis import given, strategies as st
+
+from custom_components.budgetenvelope.derived import (
+    MAX_CENTS,
+    _div_round,
+    derive_columns,
+    from_cents,
+    money,
+    to_cents,
+)
+
+CENTS = st.integers(min_value=-MAX_CENTS, max_value=MAX_CENTS)
+
+# (state, budget, carryover), also with a budget plus carryover of 0 as in
+# the rollups of envelopes whose budgets cancel out
+ROWS = st.tuples(CENTS, CENTS, CENTS) | st.builds(
+    lambda state, cents: (state, cents, -cents), CENTS, CENTS
+)
+
+
+@st.composite
+def columns(draw) -> tuple[array, array, array]:
+    """Return state, budget and carryover columns of cents."""
+    rows = draw(st.lists(ROWS, max_size=200))
+    return tuple(array("q", (row[column] for row in rows)) for column in range(3))
+
+
+def reference_percentage(state: int, budget: int, carryover: int) -> int:
+    """Return the state percentage in hundredths of a percent, exactly."""
+    if state <= 0 or budget + carryover == 0:
+        return 0
+    # round() of a Fraction rounds half to even
+    return round(Fraction(state * 10000, budget + carryover))
+
+
+@given(
+    st.integers(min_value=-(10**20), max_value=10**20),
+    st.integers(min_value=-(10**16), max_value=10**16).filter(bool),
+)
+def test_div_round(numerator: int, denominator: int) -> None:
+    """Integer division rounds half to even like round() of the fraction."""
+    assert _div_round(numerator, denominator) == round(
+        Fraction(numerator, denominator)
+    )
+
+
+@given(st.integers(min_value=-1000, max_value=1000), st.sampled_from([2, -2, 4, -4]))
+def test_div_round_ties(quotient: int, denominator: int) -> None:
+    """Exact halves round to the even neighbour."""
+    numerator = quotient * denominator + denominator // 2
+    assert _div_round(numerator, denominator) % 2 == 0
+
+
+@given(columns())
+def test_derive_columns(columns: tuple[array, array, array]) -> None:
+    """The state percentage matches the exact reference."""
+    assert derive_columns(*columns) == [
+        reference_percentage(*row) for row in zip(*columns)
+    ]
+
+
+def test_derive_columns_rollup() -> None:
+    """Rollups above MAX_CENTS do not overflow the percentage."""
+    state = array("q", [MAX_CENTS * 2, 1])
+    budget = array("q", [1, 3])
+    carryover = array("q", [0, 0])
+    assert derive_columns(state, budget, carryover) == [MAX_CENTS * 20000, 3333]
+
+
+@given(CENTS)
+def test_cents_round_trip(cents: int) -> None:
+    """Cents survive the float amounts of the states file and the entities."""
+    amount = from_cents(cents)
+    assert amount == float(Fraction(cents, 100))
+    assert to_cents(amount) == cents
+    assert money(amount) == amount
+
+
+@given(CENTS)
+def test_to_cents_of_decimal(cents: int) -> None:
+    """Amounts written with two decimals convert to their exact cents."""
+    sign = "-" if cents < 0 else ""
+    units, hundredths = divmod(abs(cents), 100)
+    assert to_cents(float(f"{sign}{units}.{hundredths:02d}")) == cents
+
+
+def test_to_cents_missing() -> None:
+    """Missing and NaN amounts count as 0."""
+    assert to_cents(None) == 0
+    assert to_cents(float("nan")) == 0
+    assert money(None) is None
+    assert money(float("nan")) is None
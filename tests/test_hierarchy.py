@@ -0,0 +1,74 @@
+"""Property tests of the rollups of the envelope hierarchy."""
+from __future__ import annotations
+
+from hypothesis import given, strategies as st
+
+from custom_components.budgetenvelope.derived import to_cents
+from custom_components.budgetenvelope.hierarchy import (
+    ROLLUP_FIELDS,
+    ROOT,
+    SEPARATOR,
+    EnvelopeTree,
+)
+
+NAMES = st.lists(
+    st.sampled_from(["Food", "Home", "Car", "Fun"]), min_size=1, max_size=3
+).map(SEPARATOR.join)
+
+AMOUNTS = st.integers(min_value=-(10**9), max_value=10**9).map(lambda c: c / 100)
+
+RECORDS = st.dictionaries(
+    NAMES,
+    st.fixed_dictionaries(
+        {"state": AMOUNTS, "budget": AMOUNTS},
+        optional={"carryover": AMOUNTS | st.just(float("nan"))},
+    ),
+    min_size=1,
+)
+
+
+def descends(envelope: str, ancestor: str) -> bool:
+    """Return True if envelope is ancestor or below it."""
+    return (
+        ancestor == ROOT
+        or envelope == ancestor
+        or envelope.startswith(ancestor + SEPARATOR)
+    )
+
+
+@given(RECORDS)
+def test_rollups(records: dict[str, dict]) -> None:
+    """Parents sum up the cents of the envelopes without children below them."""
+    tree = EnvelopeTree(records)
+    leaves = [node.name for node in tree if not node.children]
+    assert set(leaves) <= records.keys()
+
+    for node in tree:
+        for field in ROLLUP_FIELDS:
+            assert node.rollup[field] == sum(
+                to_cents(records[leaf].get(field))
+                for leaf in leaves
+                if descends(leaf, node.name)
+            )
+
+
+@given(RECORDS)
+def test_rollup_records(records: dict[str, dict]) -> None:
+    """Only the parents without a record of their own get a rollup record."""
+    tree = EnvelopeTree(records)
+    rollups = tree.rollup_records()
+    assert ROOT in tree
+    assert rollups.keys() == {node.name for node in tree} - records.keys()
+    for envelope, record in rollups.items():
+        assert record["rollup"]
+        for field in ROLLUP_FIELDS:
+            assert to_cents(record[field]) == tree[envelope].rollup[field]
+
+
+@given(RECORDS)
+def test_parents_first(records: dict[str, dict]) -> None:
+    """Iterating the tree visits every parent before its children."""
+    seen = set()
+    for node in EnvelopeTree(records):
+        assert node.parent is None or node.parent.name in seen
+        seen.add(node.name)
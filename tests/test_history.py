@@ -0,0 +1,68 @@
+"""Property tests of the columnar month history."""
+from __future__ import annotations
+
+import math
+
+from hypothesis import given, strategies as st
+
+from custom_components.budgetenvelope.history import (
+    HistoryStore,
+    month_index,
+    month_label,
+)
+
+MONTHS = st.integers(min_value=2020 * 12, max_value=2030 * 12 - 1)
+
+RECORDS = st.lists(
+    st.tuples(
+        st.sampled_from(["Food", "Food:Groceries", "Car"]),
+        MONTHS,
+        st.integers(min_value=-(10**6), max_value=10**6).map(lambda c: c / 100),
+        st.none() | st.just(math.nan) | st.floats(-1000, 1000),
+    ),
+    max_size=50,
+)
+
+
+@given(RECORDS)
+def test_last_record_of_a_month_wins(records: list) -> None:
+    """Months are ordered and the last of duplicate records is kept."""
+    store = HistoryStore()
+    expected: dict[str, dict[int, tuple]] = {}
+    for envelope, month, state, carryover in records:
+        store.add(envelope, month, {"state": state, "carryover": carryover})
+        expected.setdefault(envelope, {})[month] = (state, carryover)
+    store.finish()
+
+    assert len(store) == sum(len(months) for months in expected.values())
+    for envelope, months in expected.items():
+        assert store.months(envelope) == [
+            month_label(month) for month in sorted(months)
+        ]
+        for month, (state, carryover) in months.items():
+            values = store.get(envelope, month_label(month))
+            assert values["state"] == state
+            if carryover is None or math.isnan(carryover):
+                assert values["carryover"] is None
+            else:
+                assert values["carryover"] == carryover
+        assert store.series(envelope, "state") == [
+            (month_label(month), months[month][0]) for month in sorted(months)
+        ]
+
+
+@given(MONTHS)
+def test_month_label(month: int) -> None:
+    """Month labels and indexes convert into each other."""
+    assert month_index(month_label(month)) == month
+
+
+def test_missing() -> None:
+    """Unknown envelopes and months have no history."""
+    store = HistoryStore()
+    store.add("Food", month_index("2024-01"), {"state": 1})
+    store.finish()
+    assert store.get("Car", "2024-01") is None
+    assert store.get("Food", "2024-02") is None
+    assert store.months("Car") == []
+    assert "Food" in store and "Car" not in store
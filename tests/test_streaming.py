@@ -0,0 +1,90 @@
+"""Property tests of the streaming reader against json.loads."""
+from __future__ import annotations
+
+import codecs
+import hashlib
+import io
+import json
+
+from hypothesis import given, strategies as st
+import pytest
+
+from custom_components.budgetenvelope.streaming import JsonArrayReader
+
+CHUNK_SIZES = st.sampled_from([1, 2, 3, 7, 64])
+
+# multibyte UTF-8 and escapes split across chunks
+TEXT = st.text(st.characters(codec="utf-8", exclude_categories=("Cs",)))
+
+SCALARS = (
+    st.none()
+    | st.booleans()
+    | st.integers()
+    | st.floats()
+    | st.sampled_from([0.1, -0.0, 1e300, 65.67000000000002])
+    | TEXT
+)
+
+VALUES = st.recursive(
+    SCALARS,
+    lambda children: st.lists(children, max_size=4)
+    | st.dictionaries(TEXT, children, max_size=4),
+    max_leaves=20,
+)
+
+
+@st.composite
+def documents(draw) -> bytes:
+    """Return a states file like document, a JSON array of values."""
+    items = draw(st.lists(VALUES, max_size=10))
+    text = json.dumps(
+        items,
+        ensure_ascii=draw(st.booleans()),
+        indent=draw(st.sampled_from([None, 0, 2])),
+        # NaN and Infinity, as written by the producer for missing values
+        allow_nan=True,
+    )
+    text = draw(st.sampled_from(["", " ", "\n"])) + text + draw(
+        st.sampled_from(["", "\n", " \r\n"])
+    )
+    data = text.encode()
+    if draw(st.booleans()):
+        data = codecs.BOM_UTF8 + data
+    return data
+
+
+def read(data: bytes, chunk_size: int) -> tuple[JsonArrayReader, list]:
+    """Return the reader and the items it reads from data."""
+    reader = JsonArrayReader(io.BytesIO(data), chunk_size, digest=hashlib.sha256())
+    return reader, list(reader)
+
+
+@given(documents(), CHUNK_SIZES)
+def test_items(data: bytes, chunk_size: int) -> None:
+    """The items are those of json.loads, whatever the chunk size."""
+    reader, items = read(data, chunk_size)
+    expected = json.loads(data.decode("utf-8-sig"))
+    # compared as JSON so that NaN equals NaN
+    assert json.dumps(items) == json.dumps(expected)
+    assert reader.items == len(expected)
+    assert reader.bytes_read == len(data)
+    assert reader.digest.digest() == hashlib.sha256(data).digest()
+
+
+@given(documents(), CHUNK_SIZES, st.data())
+def test_truncated(data: bytes, chunk_size: int, draw: st.DataObject) -> None:
+    """A file cut off before its closing bracket is invalid."""
+    end = draw.draw(st.integers(min_value=0, max_value=data.rindex(b"]")))
+    with pytest.raises(ValueError):
+        read(data[:end], chunk_size)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"{}", b"[1 2]", b"[1,]", b"[1] [2]", b"[1]x", b"[\xff]"],
+)
+@pytest.mark.parametrize("chunk_size", [1, 64])
+def test_invalid(data: bytes, chunk_size: int) -> None:
+    """Documents that are not a single JSON array are invalid."""
+    with pytest.raises(ValueError):
+        read(data, chunk_size)
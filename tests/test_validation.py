@@ -0,0 +1,93 @@
+"""Tests of the validation of the states records."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.budgetenvelope.derived import MAX_CENTS
+from custom_components.budgetenvelope.validation import (
+    MAX_REPORTS,
+    Quarantine,
+    RecordError,
+    validate_record,
+)
+
+VALID = {
+    "envelope": "Food:Groceries",
+    "month": "2024-02",
+    "state": 12.5,
+    "budget": 400,
+    "carryover": 20.25,
+    "adjustment": -5,
+    "state_month": 3.5,
+}
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {},
+        # the root envelope
+        {"envelope": None},
+        # records without month, and without the optional amounts
+        {"month": None, "carryover": None, "adjustment": None, "state_month": None},
+        # the producer writes NaN for missing optional amounts
+        {"carryover": float("nan")},
+        {"adjustment": float("nan"), "state_month": float("nan")},
+        {"state": 0, "budget": 0, "carryover": 0},
+        # the state percentage is 0, as for the rollups
+        {"budget": 10, "carryover": -10},
+        {"state": -5, "budget": 10, "carryover": -10},
+        {"state": MAX_CENTS / 100},
+    ],
+)
+def test_valid(changes: dict) -> None:
+    """Valid records have no error."""
+    record = VALID | changes
+    if record["month"] is None:
+        del record["month"]
+    assert validate_record(record) is None
+
+
+@pytest.mark.parametrize(
+    ("record", "field", "reason"),
+    [
+        (["Food"], None, "expected an object, got list"),
+        ({"state": 1, "budget": 1}, "envelope", "missing"),
+        (VALID | {"envelope": 1}, "envelope", "expected a string, got int"),
+        (VALID | {"month": "2024-13"}, "month", 'expected "YYYY-MM", got \'2024-13\''),
+        (VALID | {"month": 202402}, "month", 'expected "YYYY-MM", got 202402'),
+        (VALID | {"state": None}, "state", "missing"),
+        (VALID | {"budget": "400"}, "budget", "expected a number, got str"),
+        (VALID | {"budget": True}, "budget", "expected a number, got bool"),
+        (VALID | {"state": float("nan")}, "state", "expected a finite number, got nan"),
+        (
+            VALID | {"carryover": float("inf")},
+            "carryover",
+            "expected a finite number, got inf",
+        ),
+        (
+            VALID | {"state": 1e20},
+            "state",
+            f"expected at most {MAX_CENTS // 100} in absolute value, got 1e+20",
+        ),
+        (
+            VALID | {"budget": float("nan")},
+            "budget",
+            "expected a finite number, got nan",
+        ),
+    ],
+)
+def test_invalid(record, field: str | None, reason: str) -> None:
+    """Invalid records report the first invalid field and why."""
+    assert validate_record(record) == (field, reason)
+
+
+def test_quarantine() -> None:
+    """The quarantine counts all errors and keeps the first reports."""
+    quarantine = Quarantine()
+    for index in range(MAX_REPORTS + 5):
+        quarantine.add(RecordError(index, "Food", "state", "missing"))
+    assert len(quarantine) == MAX_REPORTS + 5
+    assert [error.index for error in quarantine.reports] == list(range(MAX_REPORTS))
+    assert str(quarantine.reports[0]) == "record 0 ('Food') state: missing"
+    assert str(RecordError(3, None, None, "bad")) == "record 3: bad"